@@ -33,6 +33,7 @@ class ThreadPool:
         self._min_workers = min_workers
         self._idle_timeout = idle_timeout
         self._shutdown = False
+        self._shutdown_lock = threading.Lock()
         
         # 创建线程池执行器
         self._executor = ThreadPoolExecutor(
@@ -79,10 +80,12 @@ class ThreadPool:
         Args:
             wait: 是否等待所有任务完成
         """
-        if not self._shutdown:
+        with self._shutdown_lock:
+            if self._shutdown:
+                return
             self._shutdown = True
-            self._executor.shutdown(wait=wait)
-            system_logger.info("线程池已关闭")
+        self._executor.shutdown(wait=wait)
+        system_logger.info("线程池已关闭")
             
     @property
     def is_shutdown(self) -> bool:
@@ -4,6 +4,7 @@
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PIL import Image
 import numpy as np
@@ -50,13 +51,21 @@ class FileStorage:
             # 生成基础文件名
             base_name = f"temp_{np.random.randint(10000)}" if is_temp else f"slice{slice_idx}"
             
-            # 保存所有维度的图像
+            # 并行保存所有维度的图像，PNG编码期间会释放GIL
             image_paths = {}
-            for dim_name, img_data in image_data.items():
-                file_name = f"{base_name}_{dim_name.upper()}.png"
-                file_path = self.save_image(img_data, file_name, is_temp)
-                if file_path:
-                    image_paths[dim_name] = file_path
+            if not image_data:
+                return image_paths
+            
+            dim_names = list(image_data.keys())
+            with ThreadPoolExecutor(max_workers=len(dim_names)) as executor:
+                file_paths = executor.map(
+                    lambda dim_name: self.save_image(
+                        image_data[dim_name], f"{base_name}_{dim_name.upper()}.png", is_temp),
+                    dim_names
+                )
+                for dim_name, file_path in zip(dim_names, file_paths):
+                    if file_path:
+                        image_paths[dim_name] = file_path
             
             return image_paths
             
@@ -9,6 +9,7 @@
 """
 
 from enum import Enum, auto
+from functools import lru_cache
 from typing import Dict
 
 
@@ -186,10 +187,25 @@ class StyleSheets:
     def get_styles(cls) -> Dict[str, str]:
         """获取所有样式定义
         
+        样式表按主题缓存，同一主题下重复调用返回同一个字典，调用方不应修改。
+        
+        Returns:
+            Dict[str, str]: 样式定义字典，键为样式名称，值为样式表字符串
+        """
+        return cls._build_styles(cls._current_theme)
+    
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _build_styles(cls, theme: Theme) -> Dict[str, str]:
+        """生成指定主题的样式定义
+        
+        Args:
+            theme: 主题
+            
         Returns:
             Dict[str, str]: 样式定义字典，键为样式名称，值为样式表字符串
         """
-        colors = cls._theme_colors
+        colors = cls._theme_map.get(theme, ThemeColors.DEFAULT)
         return {
             'main_window': f"""
                 QMainWindow {{
@@ -411,9 +427,12 @@ class StyleSheets:
         }
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_dimensions() -> Dict[str, int]:
         """获取固定尺寸定义
         
+        尺寸定义为常量，仅在首次调用时生成，调用方不应修改返回的字典。
+        
         Returns:
             Dict[str, int]: 尺寸定义字典，键为尺寸名称，值为像素值
         """
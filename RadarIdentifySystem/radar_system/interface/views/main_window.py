@@ -2,13 +2,14 @@
 
 本模块实现了应用程序的主窗口，负责创建和管理用户界面。
 """
+import threading
 from typing import Dict, Optional
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QFileDialog, 
     QMessageBox, QLineEdit, QTableWidgetItem, 
     QPushButton, QCheckBox, QApplication
 )
-from PyQt5.QtCore import Qt, QSettings, QThread, QTimer, QMetaObject
+from PyQt5.QtCore import Qt, QSettings, QThread, QTimer, QMetaObject, Q_ARG, QRect, QSize, pyqtSlot
 from pathlib import Path
 
 from radar_system.interface.styles.style_sheets import StyleSheets
@@ -57,7 +58,9 @@ class MainWindow(QMainWindow):
             self.dimensions = StyleSheets.get_dimensions()
             
 
-            # 初始化线程池
+            # 初始化线程池，关闭窗口和应用退出时都会清理，通过标志保证只清理一次
+            self._cleanup_lock = threading.Lock()
+            self._resources_cleaned = False
             self.thread_pool = ThreadPool(
                 max_workers=4,  # 可以根据需要调整
                 min_workers=2,
@@ -141,17 +144,23 @@ class MainWindow(QMainWindow):
             default_y = (screen.height() - window_height) // 2
             
             # 如果是首次启动（配置中没有位置信息）或位置在屏幕外，则使用中心位置
-            if window_x is None or window_y is None or \
-               window_x < 0 or window_x > screen.width() - window_width or \
-               window_y < 0 or window_y > screen.height() - window_height:
-                window_x = default_x
-                window_y = default_y
-            
+            window_rect = QRect(
+                default_x if window_x is None else window_x,
+                default_y if window_y is None else window_y,
+                window_width,
+                window_height
+            )
+            if not screen.contains(window_rect):
+                window_rect.moveTo(default_x, default_y)
+
             # 设置窗口位置和大小
-            self.setGeometry(window_x, window_y, window_width, window_height)
+            self.setGeometry(window_rect)
             self.setStyleSheet(self.styles.get("main_window", ""))
-            
-            ui_logger.debug(f"窗口位置已设置: x={window_x}, y={window_y}, width={window_width}, height={window_height}")
+
+            ui_logger.debug(
+                f"窗口位置已设置: x={window_rect.x()}, y={window_rect.y()}, "
+                f"width={window_width}, height={window_height}"
+            )
             
         except Exception as e:
             raise UIError(
@@ -193,8 +202,8 @@ class MainWindow(QMainWindow):
             # 使用中央部件作为父窗口
             self.loading_spinner = LoadingSpinner(self.centralWidget())
             # 设置加载动画的初始大小和位置
-            self.loading_spinner.resize(self.centralWidget().size())
-            self.loading_spinner.move(0, 0)
+            self._spinner_last_size = QSize()
+            self._sync_spinner_geometry(force=True)
             self.loading_spinner.hide()
         except Exception as e:
             raise UIError(
@@ -273,8 +282,7 @@ class MainWindow(QMainWindow):
             super().resizeEvent(event)
             # 更新加载动画大小和位置
             if hasattr(self, 'loading_spinner') and self.loading_spinner.isVisible():
-                self.loading_spinner.resize(self.centralWidget().size())
-                self.loading_spinner.move(0, 0)
+                self._sync_spinner_geometry()
             # 根据配置决定是否保存窗口大小
             if self.config_manager.ui.remember_window_position:
                 size = self.size()
@@ -283,6 +291,20 @@ class MainWindow(QMainWindow):
         except Exception as e:
             ui_logger.error(f"窗口大小调整失败: {str(e)}")
     
+    def _sync_spinner_geometry(self, force: bool = False) -> None:
+        """使加载动画覆盖整个中央部件
+        
+        缓存上一次应用的尺寸，尺寸未变化时跳过更新，避免窗口拖拽缩放时
+        逐帧重复设置几何属性。
+        
+        Args:
+            force: 是否忽略缓存强制更新
+        """
+        size = self.centralWidget().size()
+        if force or size != self._spinner_last_size:
+            self.loading_spinner.setGeometry(0, 0, size.width(), size.height())
+            self._spinner_last_size = size
+    
     def closeEvent(self, event) -> None:
         """窗口关闭事件处理
         
@@ -299,10 +321,19 @@ class MainWindow(QMainWindow):
             
             if reply == QMessageBox.Yes:
                 ui_logger.info("用户确认退出程序")
+                # 在后台线程中关闭线程池，与保存配置并行进行，避免界面卡顿
+                cleanup_thread = threading.Thread(
+                    target=self.cleanup_resources,
+                    name="radar_cleanup",
+                    daemon=True
+                )
+                cleanup_thread.start()
                 # 保存配置
                 self.config_manager.save_config()
-                # 清理资源
-                self.cleanup_resources()
+                # 最多等待2秒，超时则让剩余任务在后台结束
+                cleanup_thread.join(timeout=2.0)
+                if cleanup_thread.is_alive():
+                    ui_logger.warning("线程池关闭超时，剩余任务将在后台结束")
                 event.accept()
             else:
                 ui_logger.debug("用户取消退出")
@@ -312,7 +343,15 @@ class MainWindow(QMainWindow):
             event.accept()
     
     def cleanup_resources(self) -> None:
-        """清理资源"""
+        """清理资源
+        
+        关闭窗口时在后台线程中调用，应用退出时由aboutToQuit再次调用，
+        重复调用直接返回。只关闭线程池，不访问Qt对象。
+        """
+        with self._cleanup_lock:
+            if self._resources_cleaned:
+                return
+            self._resources_cleaned = True
         try:
             ui_logger.info("正在清理资源...")
             # 关闭线程池
@@ -330,25 +369,35 @@ class MainWindow(QMainWindow):
         3. 其他UI组件信号
         """
         try:
+            # 按钮信号与窗口位于同一线程，直接调用槽函数
+            direct = Qt.DirectConnection | Qt.UniqueConnection
+            # 处理器信号可能由工作线程触发，统一经事件队列投递到主线程
+            queued = Qt.QueuedConnection | Qt.UniqueConnection
+            
             # 导入相关按钮信号
-            self.browse_btn.clicked.connect(self._on_browse_import)
-            self.import_btn.clicked.connect(self._on_import_data)
+            self._connect_unique(self.browse_btn.clicked, self._on_browse_import, direct)
+            self._connect_unique(self.import_btn.clicked, self._on_import_data, direct)
             
             # 导入处理器信号 - 使用统一的信号命名
-            self.signal_import_handler.import_started.connect(self._on_import_started)
-            self.signal_import_handler.import_completed.connect(self._on_import_completed)
-            self.signal_import_handler.import_failed.connect(self._on_import_error)
-            self.signal_import_handler.file_selected.connect(self._on_file_selected)
+            self._connect_unique(self.signal_import_handler.import_started, self._on_import_started, queued)
+            self._connect_unique(self.signal_import_handler.import_completed, self._on_import_completed, queued)
+            self._connect_unique(self.signal_import_handler.import_failed, self._on_import_error, queued)
+            self._connect_unique(self.signal_import_handler.file_selected, self._on_file_selected, queued)
             
             # 切片按钮信号
-            self.start_slice_btn.clicked.connect(self._on_start_slice)
-            self.next_slice_btn.clicked.connect(self._on_next_slice)
+            self._connect_unique(self.start_slice_btn.clicked, self._on_start_slice, direct)
+            self._connect_unique(self.next_slice_btn.clicked, self._on_next_slice, direct)
 
             # 切片相关信号
-            self.slice_handler.slice_started.connect(self._on_slice_started)
-            self.slice_handler.slice_completed.connect(self._on_slice_completed)
-            self.slice_handler.slice_failed.connect(self._on_slice_error)
-            self.slice_handler.slice_display_ready.connect(self._on_slice_display_ready)
+            self._connect_unique(self.slice_handler.slice_started, self._on_slice_started, queued)
+            self._connect_unique(self.slice_handler.slice_completed, self._on_slice_completed, queued)
+            self._connect_unique(self.slice_handler.slice_failed, self._on_slice_error, queued)
+            self._connect_unique(self.slice_handler.slice_display_ready, self._on_slice_display_ready, queued)
+            
+            # 应用退出时确保线程池被关闭（未经closeEvent退出时），已清理过则直接返回
+            app = QApplication.instance()
+            if app is not None:
+                self._connect_unique(app.aboutToQuit, self.cleanup_resources, direct)
             
             ui_logger.debug("信号连接设置完成")
             
@@ -364,6 +413,22 @@ class MainWindow(QMainWindow):
                 }
             ) from e
     
+    def _connect_unique(self, signal, slot, connection_type) -> None:
+        """以指定连接类型连接信号与槽
+        
+        连接类型中包含Qt.UniqueConnection，重复连接时PyQt会抛出TypeError，
+        此处将其视为无操作，使_setup_signals可以安全地重复调用。
+        
+        Args:
+            signal: 要连接的信号
+            slot: 槽函数
+            connection_type: Qt连接类型
+        """
+        try:
+            signal.connect(slot, connection_type)
+        except TypeError:
+            ui_logger.debug(f"信号已连接，跳过重复连接: {slot.__name__}")
+    
     def _on_browse_import(self) -> None:
         """浏览文件按钮点击事件处理"""
         self.signal_import_handler.browse_file(self)
@@ -397,18 +462,17 @@ class MainWindow(QMainWindow):
         try:
             # 显示加载动画
             if hasattr(self, 'loading_spinner'):
-                self.loading_spinner.resize(self.centralWidget().size())
-                self.loading_spinner.move(0, 0)
+                self._sync_spinner_geometry(force=True)
                 self.loading_spinner.raise_()
                 self.loading_spinner.start()
             
             # 禁用按钮
             self.browse_btn.setEnabled(False)
             self.import_btn.setEnabled(False)
-            
-            # 强制更新界面
-            QApplication.processEvents()
-            
+
+            # 耗时任务已在线程池中执行，动画将在下一轮事件循环中自然绘制，
+            # 无需调用processEvents强制刷新（避免重入式事件分发）
+
             ui_logger.debug("加载动画已启动")
             
         except Exception as e:
@@ -442,6 +506,30 @@ class MainWindow(QMainWindow):
     def _on_import_completed(self, success: bool) -> None:
         """导入完成的槽函数
         
+        确保导入结果的UI更新在主线程中执行，具体更新由
+        _apply_import_result 完成。
+        
+        Args:
+            success: 是否成功
+        """
+        try:
+            # 如果当前不在主线程，则通过事件循环调用
+            if QThread.currentThread() is not QApplication.instance().thread():
+                QMetaObject.invokeMethod(
+                    self, "_apply_import_result",
+                    Qt.QueuedConnection,
+                    Q_ARG(bool, success)
+                )
+            else:
+                self._apply_import_result(success)
+                
+        except Exception as e:
+            ui_logger.error(f"导入完成处理失败: {str(e)}")
+    
+    @pyqtSlot(bool)
+    def _apply_import_result(self, success: bool) -> None:
+        """应用导入结果到界面
+        
         处理导入完成后的所有UI更新操作，包括：
         1. 停止加载动画
         2. 更新按钮状态
@@ -452,50 +540,42 @@ class MainWindow(QMainWindow):
             success: 是否成功
         """
         try:
-            # 确保在主线程中执行UI操作
-            def update_ui():
-                try:
-                    # 停止加载动画
-                    self._stop_loading_animation()
-                    
-                    # 更新按钮状态和数据显示
-                    if success:
-                        # 导入成功时，只启用开始切片按钮，其他操作按钮保持禁用
-                        self._update_buttons_state(False)  # 先全部禁用
-                        self.start_slice_btn.setEnabled(True)  # 仅启用开始切片按钮
-                        
-                        # 更新波段和切片信息显示
-                        if hasattr(self, 'slice_info_label1') and hasattr(self, 'slice_info_label2'):
-                            signal = self.signal_service.current_signal
-                            self.slice_info_label1.setText(f"数据包位于{signal.band_type}，")
-                            self.slice_info_label2.setText(f"预计将获得{signal.expected_slices}个250ms切片")
-                            
-                        ui_logger.debug("数据导入完成，已更新按钮状态和切片数量显示")
-                    else:
-                        # 导入失败，禁用所有按钮
-                        self._update_buttons_state(False)
-                        
-                        # 更新切片数量显示为未知状态
-                        if hasattr(self, 'slice_info_label1') and hasattr(self, 'slice_info_label2'):
-                            self.slice_info_label1.setText("数据包位于?波段，")
-                            self.slice_info_label2.setText("预计将获得?个250ms切片")
-                            
-                        ui_logger.debug("数据导入失败，已禁用所有按钮")
+            # 停止加载动画
+            self._stop_loading_animation()
+            
+            # 更新按钮状态和数据显示
+            if success:
+                # 导入成功时，只启用开始切片按钮，其他操作按钮保持禁用
+                self._update_buttons_state(False)  # 先全部禁用
+                self.start_slice_btn.setEnabled(True)  # 仅启用开始切片按钮
+                
+                # 更新波段和切片信息显示
+                if hasattr(self, 'slice_info_label1') and hasattr(self, 'slice_info_label2'):
+                    signal = self.signal_service.current_signal
+                    self.slice_info_label1.setText(f"数据包位于{signal.band_type}，")
+                    self.slice_info_label2.setText(f"预计将获得{signal.expected_slices}个250ms切片")
                     
-                    # 使用延迟显示对话框，确保动画已经完全停止
-                    QTimer.singleShot(100, lambda: self._show_import_result(success))
+                ui_logger.debug("数据导入完成，已更新按钮状态和切片数量显示")
+            else:
+                # 导入失败，禁用所有按钮
+                self._update_buttons_state(False)
+                
+                # 更新切片数量显示为未知状态
+                if hasattr(self, 'slice_info_label1') and hasattr(self, 'slice_info_label2'):
+                    self.slice_info_label1.setText("数据包位于?波段，")
+                    self.slice_info_label2.setText("预计将获得?个250ms切片")
                     
-                except Exception as e:
-                    ui_logger.error(f"更新UI失败: {str(e)}")
+                ui_logger.debug("数据导入失败，已禁用所有按钮")
             
-            # 如果当前不在主线程，则通过事件循环调用
-            if QThread.currentThread() is not QApplication.instance().thread():
-                QMetaObject.invokeMethod(self, update_ui, Qt.QueuedConnection)
+            if success:
+                # 成功提示显示在状态栏，不阻塞事件循环
+                self._show_import_result(True)
             else:
-                update_ui()
-                
+                # 使用延迟显示对话框，确保动画已经完全停止
+                QTimer.singleShot(100, lambda: self._show_import_result(False))
+            
         except Exception as e:
-            ui_logger.error(f"导入完成处理失败: {str(e)}")
+            ui_logger.error(f"更新UI失败: {str(e)}")
         
     def _on_import_error(self, error_msg: str) -> None:
         """导入错误的槽函数
@@ -541,10 +621,16 @@ class MainWindow(QMainWindow):
             ui_logger.error(f"清空显示内容时出错: {str(e)}")
             
     def _show_import_result(self, success: bool) -> None:
-        """显示导入结果对话框"""
+        """显示导入结果
+        
+        成功时在状态栏显示非模态提示，失败时弹出警告对话框。
+        
+        Args:
+            success: 是否成功
+        """
         try:
             if success:
-                QMessageBox.information(self, "成功", "数据导入成功")
+                self.statusBar().showMessage("数据导入成功", 3000)
             else:
                 QMessageBox.warning(self, "失败", "数据导入失败")
         except Exception as e:
@@ -585,6 +671,8 @@ class MainWindow(QMainWindow):
         try:
             self._stop_loading_animation()
             if success:
+                self._show_slice_result(True)
+                
                 # 更新按钮状态
                 self.next_slice_btn.setEnabled(True)
                 self.identify_btn.setEnabled(True)
@@ -674,13 +762,17 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "错误", f"切片导航出错: {str(e)}")
 
     def _show_slice_result(self, success: bool) -> None:
-        """显示切片结果对话框
+        """显示切片结果
+
+        成功时在状态栏显示非模态提示，失败时弹出警告对话框。
 
         Args:
             success: 是否成功
         """
         try:
-            if not success:
+            if success:
+                self.statusBar().showMessage("切片处理完成", 3000)
+            else:
                 QMessageBox.warning(self, "警告", "切片处理失败")
         except Exception as e:
             ui_logger.error(f"显示切片结果对话框失败: {str(e)}")
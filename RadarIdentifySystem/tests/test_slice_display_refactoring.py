@@ -7,22 +7,66 @@
 4. 功能完整性保持不变
 """
 
+import tempfile
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, MagicMock
 import numpy as np
 from pathlib import Path
 
 from radar_system.application.services.signal_service import SignalService
-from radar_system.domain.signal.entities.signal import SignalData, SignalSlice
+from radar_system.domain.signal.entities.signal import SignalData, SignalSlice, TimeRange
 from radar_system.domain.signal.services.processor import SignalProcessor
 from radar_system.domain.signal.services.plotter import SignalPlotter
 from radar_system.infrastructure.persistence.excel.reader import ExcelReader
 from radar_system.infrastructure.persistence.file.file_storage import FileStorage
+from radar_system.infrastructure.common.config import ConfigManager
+
+
+_config_dir = None
+
+
+def setUpModule():
+    """初始化全局配置管理器
+    
+    SignalService在构造时读取全局ConfigManager，未初始化时抛出
+    ConfigError("配置管理器未初始化")，本模块的测试因此全部失败。
+    配置文件放在临时目录中，避免污染项目目录。
+    """
+    global _config_dir
+    _config_dir = tempfile.TemporaryDirectory()
+    ConfigManager.initialize(str(Path(_config_dir.name) / "configs" / "config.json"))
+
+
+def tearDownModule():
+    """清理配置文件临时目录"""
+    _config_dir.cleanup()
+
+
+def _fixture(shape: tuple, seed: int = 0) -> np.ndarray:
+    """按形状和种子生成可复现的测试数组"""
+    return np.random.default_rng(seed).random(shape)
 
 
 class TestSliceDisplayRefactoring(unittest.TestCase):
     """切片显示重构验证测试类"""
     
+    @classmethod
+    def setUpClass(cls):
+        """测试类准备：在临时目录中创建真实的图像文件，避免全局替换Path.exists"""
+        cls._temp_dir = tempfile.TemporaryDirectory()
+        image_dir = Path(cls._temp_dir.name) / "images"
+        image_dir.mkdir()
+        cls.image_paths = {}
+        for plot_type in ('CF', 'PW', 'PA', 'DTOA', 'DOA'):
+            image_path = image_dir / f"{plot_type.lower()}.png"
+            image_path.touch()
+            cls.image_paths[plot_type] = str(image_path)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """测试类清理"""
+        cls._temp_dir.cleanup()
+    
     def setUp(self):
         """测试前准备"""
         # 创建模拟组件
@@ -42,18 +86,17 @@ class TestSliceDisplayRefactoring(unittest.TestCase):
         # 创建测试数据
         self.test_signal = SignalData(
             id="test-signal-001",
-            raw_data=np.random.rand(1000, 5),
+            raw_data=_fixture((1000, 5)),
             expected_slices=4,
             is_valid=True
         )
         
         self.test_slice = SignalSlice(
             id="test-slice-001",
-            signal_id="test-signal-001",
-            data=np.random.rand(100, 5),
-            start_time=0.0,
-            end_time=250.0,
-            slice_index=1
+            parent_signal_id="test-signal-001",
+            slice_index=1,
+            time_range=TimeRange(start_time=0.0, end_time=250.0),
+            data=_fixture((100, 5), seed=1)
         )
         
     def test_prepare_slice_display_data_success(self):
@@ -64,26 +107,16 @@ class TestSliceDisplayRefactoring(unittest.TestCase):
         self.signal_service.current_slice_index = 0
         
         # 配置模拟对象
+        # 绘图结果只作为参数传给模拟的save_slice_images，无需随机内容
         self.mock_plotter.plot_slice.return_value = {
-            'CF': np.random.rand(100, 100),
-            'PW': np.random.rand(100, 100),
-            'PA': np.random.rand(100, 100),
-            'DTOA': np.random.rand(100, 100),
-            'DOA': np.random.rand(100, 100)
+            plot_type: np.empty((100, 100), dtype=np.uint8)
+            for plot_type in ('CF', 'PW', 'PA', 'DTOA', 'DOA')
         }
         
-        self.mock_file_storage.save_slice_images.return_value = {
-            'CF': '/path/to/cf.png',
-            'PW': '/path/to/pw.png',
-            'PA': '/path/to/pa.png',
-            'DTOA': '/path/to/dtoa.png',
-            'DOA': '/path/to/doa.png'
-        }
+        self.mock_file_storage.save_slice_images.return_value = dict(self.image_paths)
         
-        # 模拟文件存在检查
-        with patch('pathlib.Path.exists', return_value=True):
-            # 执行测试
-            result = self.signal_service.prepare_slice_display_data(self.test_slice)
+        # 执行测试
+        result = self.signal_service.prepare_slice_display_data(self.test_slice)
         
         # 验证结果
         self.assertTrue(result['success'])
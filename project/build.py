@@ -1,15 +1,18 @@
-import PyInstaller.__main__
 from pathlib import Path
 import os
 import sys
 import argparse
+import shutil
+import subprocess
 
 
 def build_app():
     # 解析命令行参数
     parser = argparse.ArgumentParser(description='构建雷达信号识别系统')
-    parser.add_argument('--onefile', action='store_true', help='打包为单个可执行文件，默认为目录模式')
+    parser.add_argument('--archive', action='store_true', help='打包完成后将输出目录压缩为ZIP文件用于分发')
     parser.add_argument('--optimize', action='store_true', help='优化打包大小，排除不必要的依赖')
+    parser.add_argument('--clean', action='store_true', help='清理PyInstaller分析缓存后完整重新构建')
+    parser.add_argument('--admin', action='store_true', help='请求管理员权限运行（每次启动都会弹出UAC确认）')
     args = parser.parse_args()
     
     # 获取当前目录
@@ -79,43 +82,35 @@ examples
         '--noconsole',  # 不显示控制台窗口
         '--icon', str(icon_path),  # 设置图标
         '--noconfirm',  # 覆盖输出目录
-        '--clean',  # 清理临时文件
+        
+        # 使用固定的工作目录保存分析缓存，增量构建时复用，删除该目录或使用--clean可强制完整构建
+        '--workpath', str(current_dir / 'build'),
+        '--distpath', str(current_dir / 'dist'),
         
         # 静态链接UCRT (Universal C Runtime)
         # 这是解决Windows 7兼容性问题的最佳方法
         '--target-architecture', 'x64',  # 指定64位架构
-        '--uac-admin',  # 请求管理员权限以解决某些系统级访问问题
-        
-        # 静态链接UCRT的关键参数
-        # 注意：确保Visual Studio安装了相应的C++构建工具
-        '--runtime-tmpdir', '.',  # 设置临时目录为当前目录，避免权限问题
         
         # 添加模型文件
         '--add-data', 'model_wm;model_wm',  # 添加模型文件
         
         # 隐式导入
-        '--hidden-import', 'sklearn.neighbors._partition_nodes',
-        '--hidden-import', 'sklearn.tree._partitioner',
-        '--hidden-import', 'sklearn.tree._criterion',
-        '--hidden-import', 'sklearn.tree._splitter',
-        '--hidden-import', 'sklearn.tree._utils',
-        '--hidden-import', 'sklearn.neighbors._quad_tree',
-        '--hidden-import', 'sklearn.manifold._barnes_hut_tsne',
-        '--hidden-import', 'sklearn.utils._cython_blas',
-        # 移除可能不存在的模块
-        # '--hidden-import', 'sklearn.neighbors._typedefs',
-        '--hidden-import', 'sklearn.metrics._pairwise_distances_reduction',
+        # Excel读写引擎由pandas按名称加载
+        '--hidden-import', 'xlsxwriter',
+        '--hidden-import', 'openpyxl',
+        '--hidden-import', 'python_calamine',
     ]
     
-    # 根据命令行参数选择打包模式
-    if args.onefile:
-        # 单文件模式
-        pyinstaller_args.append('--onefile')
-        package_type = "单文件"
-    else:
-        # 目录模式（默认）
-        pyinstaller_args.append('--onedir')
-        package_type = "目录"
+    if args.clean:
+        pyinstaller_args.append('--clean')  # 清理缓存，完整重新分析依赖
+    
+    if args.admin:
+        # 读取Excel数据和模型推理均不需要管理员权限，默认不请求，避免每次启动的UAC确认开销
+        pyinstaller_args.append('--uac-admin')
+    
+    # 统一使用目录模式：单文件模式每次启动都需将全部依赖解压到临时目录，启动极慢
+    pyinstaller_args.append('--onedir')
+    package_type = "目录"
         
     # 如果需要优化大小，添加排除文件
     if args.optimize:
@@ -124,6 +119,7 @@ examples
             '--exclude-module', 'tensorflow.contrib',
             '--exclude-module', 'tensorflow.examples',
             '--exclude-module', 'tensorflow.lite',
+            '--exclude-module', 'tensorboard',  # 仅用于训练可视化，推理不需要
             '--exclude-module', 'IPython',
             '--exclude-module', 'jupyter',
             '--collect-submodules', 'tensorflow.keras.models',  # 只收集实际需要的TF模块
@@ -134,12 +130,29 @@ examples
         # 尝试使用UPX，但按照正确的格式传递参数
         upx_dir = os.path.expandvars("%USERPROFILE%/.upx")
         if os.path.exists(upx_dir):
-            pyinstaller_args.extend([
-                '--upx-dir', upx_dir,
-                '--upx',
-            ])
+            # UPX会损坏或无效膨胀部分二进制（Python运行时、Qt、TensorFlow及VC运行时），
+            # --upx-exclude只接受不含路径的文件名，因此逐个列出
+            upx_excludes = [
+                f'python{sys.version_info.major}{sys.version_info.minor}.dll',
+                'python3.dll',
+                'Qt5Core.dll',
+                'Qt5Gui.dll',
+                'Qt5Widgets.dll',
+                '_pywrap_tensorflow_internal.pyd',
+                'vcruntime140.dll',
+                'vcruntime140_1.dll',
+                'VCRUNTIME140.dll',
+                'VCRUNTIME140_1.dll',
+            ]
+            for name in upx_excludes:
+                pyinstaller_args.extend(['--upx-exclude', name])
+            # 指定--upx-dir即启用UPX压缩（PyInstaller没有单独的--upx选项）
+            pyinstaller_args.extend(['--upx-dir', upx_dir])
             print(f"找到UPX目录: {upx_dir}，将使用UPX压缩")
         
+        if sys.platform != 'win32':
+            pyinstaller_args.append('--strip')  # 去除可执行文件和共享库中的符号表
+        
         # 更多排除项
         pyinstaller_args.extend([
             '--exclude-module', 'tkinter',  # 如果不使用tkinter界面
@@ -167,22 +180,29 @@ examples
     cmd_str = "pyinstaller " + " ".join([f'"{arg}"' if ' ' in str(arg) else str(arg) for arg in pyinstaller_args])
     print(f"执行命令: {cmd_str}")
     
-    PyInstaller.__main__.run(pyinstaller_args)
+    # 在独立进程中运行PyInstaller，工作目录固定为项目目录以保证相对路径（如model_wm）有效
+    subprocess.run(
+        [sys.executable, '-m', 'PyInstaller', *pyinstaller_args],
+        cwd=current_dir,
+        check=True
+    )
+
+    app_dir = current_dir / 'dist' / '雷达信号识别系统'
+    archive_path = None
+    if args.archive:
+        # 压缩输出目录用于分发，用户解压后直接运行，无需运行时解压
+        archive_path = shutil.make_archive(str(app_dir), 'zip', root_dir=app_dir.parent, base_dir=app_dir.name)
 
     print("\n打包完成！")
     print("\n【重要提示】")
     print(f"1. 已使用静态链接UCRT，提供Windows 7兼容性（{package_type}模式）{size_optimized}")
     
-    if args.onefile:
-        print("2. 应用已打包为单个可执行文件")
-        print("3. 直接分发 dist 目录下的 雷达信号识别系统.exe 文件即可")
-        print(f"4. 应用程序位于: {current_dir / 'dist' / '雷达信号识别系统.exe'}")
-        print("\n注意：单文件模式可能导致启动速度较慢，因为需要在临时目录解压依赖文件")
-    else:
-        print("2. 应用已打包为文件夹而非单个可执行文件，确保所有依赖项正确包含")
-        print("3. 分发时，请将整个'dist/雷达信号识别系统'文件夹一起分发")
-        print("4. 用户应运行文件夹中的'雷达信号识别系统.exe'文件")
-        print(f"5. 应用程序位于: {current_dir / 'dist' / '雷达信号识别系统' / '雷达信号识别系统.exe'}")
+    print("2. 应用已打包为文件夹而非单个可执行文件，确保所有依赖项正确包含")
+    print("3. 分发时，请将整个'dist/雷达信号识别系统'文件夹一起分发")
+    print("4. 用户应运行文件夹中的'雷达信号识别系统.exe'文件")
+    print(f"5. 应用程序位于: {app_dir / '雷达信号识别系统.exe'}")
+    if archive_path:
+        print(f"6. 分发用压缩包位于: {archive_path}")
     
     if args.optimize:
         print("\n优化说明：")
@@ -195,17 +215,15 @@ examples
     print("1. 在Windows 7系统上运行应用程序")
     print("2. 如果仍然出现DLL缺失错误，可考虑包含VC++可再发行组件包")
     print("\n要创建安装包，您可以：")
-    if args.onefile:
-        print("1. 直接分发单个exe文件")
-        print("2. 使用NSIS或Inno Setup创建安装程序，并自动安装VC++运行时")
-    else:
-        print("1. 将整个文件夹压缩为ZIP文件")
-        print("2. 使用NSIS或Inno Setup创建安装程序，并自动安装VC++运行时")
+    print("1. 将整个文件夹压缩为ZIP文件（可使用 --archive 自动生成）")
+    print("2. 使用NSIS或Inno Setup创建安装程序，并自动安装VC++运行时")
     print("\n使用方法:")
     print("- 默认目录模式打包: python build.py")
-    print("- 单文件模式打包: python build.py --onefile")
+    print("- 打包并生成ZIP分发包: python build.py --archive")
     print("- 优化文件大小: python build.py --optimize")
-    print("- 组合使用: python build.py --onefile --optimize")
+    print("- 组合使用: python build.py --optimize --archive")
+    print("- 完整重新构建（清理分析缓存）: python build.py --clean")
+    print("- 请求管理员权限运行: python build.py --admin")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,106 @@
+from pathlib import Path
+import argparse
+
+import tensorflow as tf
+
+
+def collect_calibration_samples(data_path: str, max_samples: int = 200) -> dict:
+    """从雷达数据文件生成INT8量化校准用的模型输入
+
+    按软件中的处理流程加载、切片并聚类数据，对每个聚类生成预测图像，
+    与推理时的输入完全一致。
+
+    Args:
+        data_path: 雷达数据Excel文件路径
+        max_samples: 最多采集的聚类数量，每个聚类生成PA和DTOA图像各一张
+
+    Returns:
+        dict: 键为图像形状(height, width)，值为形状(1, height, width, 3)的输入数组列表
+    """
+    from cores.cluster_processor import ClusterProcessor
+    from cores.data_processor import DataProcessor
+    from cores.model_predictor import ModelPredictor
+
+    processor = DataProcessor()
+    success, message, _, _ = processor.load_excel_file(data_path)
+    if not success:
+        raise RuntimeError(message)
+    processor.start_slice()
+
+    cluster_processor = ClusterProcessor()
+    cluster_processor.set_slice_time_ranges(processor.time_ranges)
+    predictor = ModelPredictor()
+    samples = {}
+    sample_count = 0
+    for slice_idx, current_slice in enumerate(processor.sliced_data):
+        cluster_processor.set_data(current_slice, slice_idx)
+        current_data = current_slice
+        for dimension in ClusterProcessor.DIM_NAMES:
+            success, cluster_result = cluster_processor.process_dimension(dimension, current_data)
+            if not success or not cluster_result:
+                break
+            for cluster in cluster_result['clusters']:
+                images = processor.plotter.render_cluster({
+                    'points': cluster['points'],
+                    'time_ranges': cluster_processor.time_ranges,
+                })
+                for image in images.values():
+                    samples.setdefault(image.shape, []).append(predictor._preprocess_array(image))
+                sample_count += 1
+                if sample_count >= max_samples:
+                    return samples
+            current_data = cluster_result['unprocessed_points']
+            if len(current_data) == 0:
+                break
+    return samples
+
+
+def convert_models():
+    """将model_wm目录下的Keras模型离线转换为TFLite模型
+
+    转换结果与原模型同名、扩展名为.tflite，ModelPredictor加载模型时
+    会优先使用不早于原模型的.tflite文件。指定--int8时使用数据文件生成的
+    预测图像校准，进行INT8训练后量化，模型输入输出仍为float32。
+    """
+    parser = argparse.ArgumentParser(description='将Keras模型转换为TFLite模型')
+    parser.add_argument('--model-dir', default=str(Path(__file__).parent / 'model_wm'),
+                        help='模型目录，默认为model_wm')
+    parser.add_argument('--int8', action='store_true',
+                        help='进行INT8训练后量化，需同时指定--calib-data')
+    parser.add_argument('--calib-data', default=None,
+                        help='用于生成量化校准图像的雷达数据Excel文件')
+    parser.add_argument('--calib-samples', type=int, default=200,
+                        help='校准使用的聚类数量，默认200')
+    args = parser.parse_args()
+
+    model_paths = sorted(Path(args.model_dir).glob('*.keras'))
+    if not model_paths:
+        print(f"未找到Keras模型: {args.model_dir}")
+        return
+
+    calibration_samples = {}
+    if args.int8:
+        if args.calib_data:
+            calibration_samples = collect_calibration_samples(args.calib_data, args.calib_samples)
+        else:
+            print("未指定--calib-data，不进行INT8量化")
+
+    for model_path in model_paths:
+        model = tf.keras.models.load_model(model_path)
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+
+        # 按模型输入尺寸选取对应的校准图像（PA与DTOA图像尺寸不同）
+        samples = calibration_samples.get(tuple(model.input_shape[1:3]), [])
+        if samples:
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.representative_dataset = lambda samples=samples: ([sample] for sample in samples)
+        elif args.int8:
+            print(f"{model_path.name} 没有可用的校准图像，按浮点模型转换")
+
+        tflite_path = model_path.with_suffix('.tflite')
+        tflite_path.write_bytes(converter.convert())
+        print(f"已转换{'(INT8)' if samples else ''}: {model_path.name} -> {tflite_path.name}")
+
+
+if __name__ == '__main__':
+    convert_models()
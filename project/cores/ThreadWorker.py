@@ -1,15 +1,60 @@
-from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtCore import QThread, QThreadPool, QRunnable, QMutex, pyqtSignal
 from cores.log_manager import LogManager
 from cores.data_processor import DataProcessor
 from cores.cluster_processor import ClusterProcessor
 from cores.model_predictor import ModelPredictor
-from typing import Tuple
-import pandas as pd
+from cores.excel_writer import EXCEL_MAX_ROWS, submit_excel_write
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional, Tuple
 import os
 
 import numpy as np
 
 
+@lru_cache(maxsize=4096)
+def _format_label_prob(label_name: str, conf: float) -> str:
+    """格式化标签及其概率，用于识别结果表
+    
+    模型输出的概率大量饱和为0或1，相同的(标签, 概率)只格式化一次。
+    
+    Args:
+        label_name: 标签名称
+        conf: 概率
+        
+    Returns:
+        str: 形如"标签: 0.9876"的字符串
+    """
+    return f'{label_name}: {conf:.4f}'
+
+
+@dataclass(slots=True)
+class ClusterInfo:
+    """全速处理中单个聚类的识别结果
+    
+    只保留保存识别结果所需的字段，聚类数据以数组引用保存。
+    """
+    dim_name: str
+    cluster_dim_idx: int
+    cluster_idx: int
+    total_cluster_count: int
+    is_valid: bool
+    pa_label: int
+    pa_conf: float
+    dtoa_label: int
+    dtoa_conf: float
+    joint_prob: float
+    pa_dict: dict
+    dtoa_dict: dict
+    cf: list = field(default_factory=list)
+    pw: list = field(default_factory=list)
+    pri: list = field(default_factory=list)
+    doa: list = field(default_factory=list)
+    current_slice_idx: int = 0
+    cluster_idx_per_slice_to_save: int = 0
+    points: Optional[np.ndarray] = None
+
 
 class DataWorker(QThread):
     """数据加载工作线程。
@@ -147,6 +192,29 @@ class SliceWorker(QThread):
 
 
 
+class SliceTask(QRunnable):
+    """全速处理中单个切片的聚类识别任务。
+    
+    由FullSpeedWorker提交到线程池执行。
+    """
+
+    def __init__(self, worker, slice_idx: int):
+        """初始化切片任务。
+        
+        Args:
+            worker: 所属的全速处理线程
+            slice_idx: 切片索引
+        """
+        super().__init__()
+        self.setAutoDelete(False)
+        self.worker = worker
+        self.slice_idx = slice_idx
+
+    def run(self):
+        """处理切片并将结果交回全速处理线程。"""
+        self.worker._run_slice_task(self.slice_idx)
+
+
 class FullSpeedWorker(QThread):
     # 信号声明
     slice_started = pyqtSignal()
@@ -177,15 +245,21 @@ class FullSpeedWorker(QThread):
 
         # 其他必要数据
         self.save_dir = self.data_controller.get_save_dir()  # 使用getter方法获取保存目录
+        try:
+            # 保存目录只需创建一次，保存结果时不再检查
+            os.makedirs(self.save_dir, exist_ok=True)
+        except OSError as e:
+            self.logger.error(f"创建保存目录出错: {str(e)}")
         self.last_file_path = self.data_controller.last_file_path if hasattr(self.data_controller, 'last_file_path') else None
         self.current_param_fingerprint = self.data_controller._generate_param_fingerprint()
         self.only_show_identify_result = self.data_controller.only_show_identify_result
+        self.one_sheet_per_slice = self.data_controller.one_sheet_per_slice
 
         # 数据初始化
         self.slice_data = []
         self.slice_count = 0
         self.valid_clusters = []
-        self.all_pulse_data_by_slice = {}
+        self.all_pulse_data_by_slice = []  # 按切片索引存放脉冲数据块列表
 
     def run(self):
         # 切片
@@ -196,17 +270,20 @@ class FullSpeedWorker(QThread):
 
         # 所有切片处理完成后，一次性保存所有结果
         save_success = False
-        pulse_save_success = False
         if all_valid_clusters:
             # 发射开始保存信号
             self.start_save.emit()
             self.logger.info("开始保存识别结果...")
             self.valid_clusters = all_valid_clusters
-            save_success, _ = self._on_save_result_fs(only_valid=True)
-            if self.all_pulse_data_by_slice: # 检查脉冲数据是否存在
-                self._on_save_pulse_data_fs() # 保存脉冲数据
+            result_future = self._on_save_result_fs()
+            pulse_future = None
+            if any(self.all_pulse_data_by_slice): # 检查脉冲数据是否存在
+                pulse_future = self._on_save_pulse_data_fs() # 保存脉冲数据
             else:
                 self.logger.warning("没有脉冲数据可保存，跳过保存脉冲数据步骤。")
+            # 两个文件在保存进程中并行写入，全部完成后再发送处理完成信号
+            save_success = self._wait_for_save(result_future, "识别结果")
+            self._wait_for_save(pulse_future, "脉冲数据")
         else:
             self.logger.warning("没有有效的聚类结果，跳过保存步骤。")
 
@@ -243,282 +320,356 @@ class FullSpeedWorker(QThread):
     def _on_cluster_identify_fs(self):
         """执行聚类处理。
         
-        对当前切片进行聚类、识别处理。
+        各切片相互独立，使用线程池并行完成聚类、识别处理，
+        保留一个CPU核心给界面线程。全部切片完成后按切片顺序汇总结果。
+        
+        Returns:
+            list: 所有切片的有效聚类结果
         """
         try:
-            # 用于存储所有切片的有效聚类结果
-            all_valid_clusters = []
-            self.all_pulse_data_by_slice = {}
+            self.all_pulse_data_by_slice = []
+            self._finished_slice_count = 0
+            self._result_mutex = QMutex()
             
-            # 开始逐片聚类
-            for slice_idx in range(len(self.slice_data)):
-                # 开始处理第slice_idx+1个切片，向UI发送当前slice_idx，表示已经完成了slice_idx片，以刷新进度条
-                self.current_slice_finished.emit(slice_idx)
-
-                try:
-                    # 获取当前切片
-                    current_slice = self.slice_data[slice_idx]
-
-                    # 数据完整性检查
-                    if current_slice is None or len(current_slice) == 0:
-                        self.logger.debug(f"切片 {slice_idx + 1} 数据无效")
-                        continue
-                    
-                    # 设置当前切片数据和时间范围
-                    self.cluster_processor.set_data(current_slice, slice_idx)
-                    self.cluster_processor.set_slice_time_ranges(self.processor.time_ranges)
-                    
-                    # 初始化处理数据
-                    self.valid_clusters = []
-                    current_data = current_slice
-                    recycled_data = []
-                    dim_idx = {'CF': 0, 'PW': 0}
-                    cluster_count = 0
-                    cluster_count_by_save = 0
-                    dimensions = ["CF", "PW"]
-                    current_slice_pulse_data_valid = []
-                    current_slice_pulse_data_invalid = []
-                    current_slice_pulse_data_remaining = []
-                    count_valid = 1
-                    count_invalid = 1
-                    count_remaining = 1
-                    
-                    # 按顺序处理每个维度
-                    for dimension in dimensions:
-                        success, cluster_result = self.cluster_processor.process_dimension(dimension, current_data)
-                        
-                        if success and cluster_result:
-                            # 处理聚类结果
-                            for cluster in cluster_result['clusters']:
-                                # 确保cluster包含必要的字段
-                                cluster_data = {
-                                    'points': cluster['points'],
-                                    'time_ranges': self.cluster_processor.time_ranges,
-                                    'slice_idx': slice_idx,
-                                    'dim_name': dimension,
-                                    'cluster_idx': cluster_count + 1
-                                }
-                                
-                                # 预测
-                                success, pa_conf, dtoa_conf, pa_label, dtoa_label, pa_conf_dict, dtoa_conf_dict = self.predictor.predict(cluster_data)
-                                
-                                if success:
-                                    # 提取有效雷达标签对应概率
-                                    pa_conf_tmp = pa_conf if pa_label != 5 else 0.0
-                                    dtoa_conf_tmp = dtoa_conf if dtoa_label != 4 else 0.0
-                                    
-                                    # 计算联合概率
-                                    joint_prob = (pa_conf_tmp * self.pa_weight + dtoa_conf_tmp * self.dtoa_weight) / (
-                                                self.pa_weight + self.dtoa_weight)
-                                    
-                                    # 判断是否为有效雷达信号（贪婪策略）
-                                    is_valid = (pa_label != 5 or dtoa_label != 4)
-
-                                    # 雷达有效时，对于脉间参差类别的特殊判别
-                                    if is_valid and dtoa_label == 1:
-                                        # 计算dtoa的集中度
-                                        dtoa = np.diff(cluster['points'][:, 4]) * 1000  # 转换为us
-                                        
-                                        # 计算统计指标
-                                        dtoa_median = np.median(dtoa)
-                                        dtoa_min = np.min(dtoa)
-                                        dtoa_max = np.max(dtoa)
-                                        
-                                        # 判断条件：
-                                        # 1. 数据范围不能超过1000us
-                                        # 2. 大部分数据应该在中位数/均值附近
-                                        data_range = dtoa_max - dtoa_min
-                                        is_range_valid = data_range <= 1000  # 范围阈值可调
-                                        
-                                        # 计算在中位数一定范围内的数据比例
-                                        center_range_ratio = 0.35  # 可调35%
-                                        in_center_count = np.sum(np.abs(dtoa - dtoa_median) <= center_range_ratio * dtoa_median)
-                                        center_ratio = in_center_count / len(dtoa)
-                                        is_centered = center_ratio >= 0.7  # 比例阈值可调
-                                        
-                                        # 综合判断
-                                        if not (is_range_valid or is_centered):
-                                            is_valid = False
-                                    
-                                    # 创建聚类信息
-                                    cluster_info = {
-                                        'dim_name': dimension,
-                                        'cluster_dim_idx': dim_idx[dimension] + 1,  # 每个维度下的类别索引
-                                        'cluster_idx': len(self.valid_clusters) + 1,  # 通过识别的聚类索引
-                                        'total_cluster_count': cluster_count + 1,  # 整体聚类结果中的索引
-                                        'cluster_data': cluster,
-                                        'is_valid': is_valid,  # 保存是否为有效雷达信号
-                                        'prediction': {
-                                            'pa_label': pa_label,
-                                            'pa_conf': pa_conf,
-                                            'dtoa_label': dtoa_label,
-                                            'dtoa_conf': dtoa_conf,
-                                            'joint_prob': joint_prob,
-                                            'pa_dict': pa_conf_dict,
-                                            'dtoa_dict': dtoa_conf_dict,
-                                        },
-                                        'CF': [],
-                                        'PW': [],
-                                        'PRI': [],
-                                        'DOA': [],
-                                    }
-                                    # 提取并更新参数
-                                    self.data_controller._extract_cluster_parameters(cluster_info)
-
-                                    # 微观保存脉冲数据：收集脉冲数据
-                                    last_toa = None
-                                    cluster_points = cluster['points']
-                                    for point in cluster_points:
-                                        if last_toa is None:
-                                            last_toa = point[4]
-                                        pulse_data = {
-                                            '类别': 'valid' if is_valid else 'invalid',
-                                            '聚类维度': dimension,
-                                            '序号': count_valid if is_valid else count_invalid,
-                                            '切片内序号': cluster_info['total_cluster_count'],
-                                            '载频': point[0],
-                                            '脉宽': point[1],
-                                            '方位角': point[2],
-                                            '幅度': point[3],
-                                            '到达时间': point[4],
-                                            '到达时间差': (point[4] - last_toa) * 1000
-                                        }
-                                        last_toa = point[4]
-                                        if is_valid:
-                                            current_slice_pulse_data_valid.append(pulse_data)
-                                        else:
-                                            # 仅在PW维度下收集无效脉冲数据，避免重复收集脉冲
-                                            if dimension == 'PW':
-                                                current_slice_pulse_data_invalid.append(pulse_data)
-                                    
-
-                                    # 递增聚类序号
-                                    cluster_count += 1
-
-                                    # 宏观保存识别结果：收集所有结果
-                                    if is_valid:
-                                        cluster_count_by_save += 1
-                                        # 将当前切片索引添加到cluster_info
-                                        cluster_info['current_slice_idx'] = slice_idx
-                                        cluster_info['cluster_idx_per_slice_to_save'] = cluster_count_by_save
-                                        all_valid_clusters.append(cluster_info)
-                                        count_valid += 1
-                                    
-                                    # 处理无效数据
-                                    if not is_valid:
-                                        recycled_data.extend(cluster['points'].tolist())
-                                        if dimension == 'PW':
-                                            count_invalid += 1
-                                        
-                                    # 保存聚类结果
-                                    if not self.only_show_identify_result or is_valid:
-                                        dim_idx[dimension] += 1
-                                        self.valid_clusters.append(cluster_info)
-                            
-                            # 更新待处理数据
-                            unprocessed_data = cluster_result.get('unprocessed_points', [])
-                            if not isinstance(unprocessed_data, list):
-                                unprocessed_data = unprocessed_data.tolist()
-                            
-                            # 合并回收数据和未聚类数据
-                            # 对于CF维度，无效数据和未聚类数据合并，对于PW维度，只保留未聚类数据（因为无效数据已经保存过了）
-                            if dimension == 'CF':
-                                if recycled_data and unprocessed_data:
-                                    current_data = np.vstack((recycled_data, unprocessed_data))
-                                elif recycled_data:
-                                    current_data = recycled_data
-                                else:
-                                    current_data = unprocessed_data
-                            elif dimension == 'PW':
-                                current_data = unprocessed_data
-
-                    # 处理当前切片最终的剩余脉冲
-                    last_toa = None
-                    if current_data is not None and len(current_data) > 0:
-                        # 确保 current_data 是 NumPy 数组
-                        if not isinstance(current_data, np.ndarray):
-                            try:
-                                current_data = np.array(current_data)
-                            except ValueError as ve:
-                                self.logger.error(f"切片 {slice_idx + 1} 剩余数据无法转换为Numpy数组: {ve}")
-                                current_data = None # 标记为无法处理
-
-                        # 检查数据维度是否正确
-                        if current_data.ndim == 2 and current_data.shape[1] >= 5:
-                            for point in current_data:
-                                if last_toa is None:
-                                    last_toa = point[4]
-                                current_slice_pulse_data_remaining.append({
-                                    '类别': 'remaining',
-                                    '聚类维度': '——',
-                                    '序号': '——',
-                                    '切片内序号': '——',
-                                    '载频': point[0],
-                                    '脉宽': point[1],
-                                    '方位角': point[2],
-                                    '幅度': point[3],
-                                    '到达时间': point[4],
-                                    '到达时间差': (point[4] - last_toa) * 1000
-                                })
-                                last_toa = point[4]
-                        elif current_data.ndim == 1 and len(current_data) >= 5: # 单个脉冲数据
-                            point = current_data
-                            current_slice_pulse_data_remaining.append({
-                                '类别': 'remaining',
-                                '聚类维度': '——',
-                                '序号': '——',
-                                '切片内序号': '——',
-                                '载频': point[0],
-                                '脉宽': point[1],
-                                '方位角': point[2],
-                                '幅度': point[3],
-                                '到达时间': point[4],
-                                '到达时间差': 0
-                            })
-                        else:
-                            self.logger.warning(f"切片 {slice_idx + 1} 的剩余脉冲数据格式不正确，无法保存。Shape: {current_data.shape}")
-
-                    # 存储当前切片的脉冲数据
-                    if current_slice_pulse_data_valid or current_slice_pulse_data_invalid or current_slice_pulse_data_remaining:
-                        self.logger.info(f"切片 {slice_idx + 1} 存在脉冲数据")
-                        self.all_pulse_data_by_slice[slice_idx] = current_slice_pulse_data_valid + current_slice_pulse_data_invalid + current_slice_pulse_data_remaining
-                    else:
-                        self.logger.info(f"切片 {slice_idx + 1} 没有脉冲数据")
-
-                except Exception as e:
-                    self.logger.error(f"处理切片数据时出错: {str(e)}")
-                    continue
+            slice_count = len(self.slice_data)
+            self._total_slice_count = slice_count
+            # 按切片索引预先分配结果列表，各任务只写入自己的位置
+            self._slice_results = [None] * slice_count
+            # 切片较多时每完成若干切片才刷新一次进度，最多约200次跨线程信号
+            self._progress_emit_every = max(1, slice_count // 200)
+            pool = QThreadPool()
+            pool.setMaxThreadCount(max(1, (os.cpu_count() or 2) - 1))
+            
+            # 保持任务引用直到线程池执行完毕
+            tasks = [SliceTask(self, slice_idx) for slice_idx in range(slice_count)]
+            for task in tasks:
+                pool.start(task)
+            pool.waitForDone()
+            
+            # 按切片顺序汇总有效聚类结果和脉冲数据
+            slice_results = [result or ([], []) for result in self._slice_results]
+            all_valid_clusters = [cluster for slice_valid_clusters, _ in slice_results for cluster in slice_valid_clusters]
+            self.all_pulse_data_by_slice = [pulse_blocks for _, pulse_blocks in slice_results]
             
             return all_valid_clusters
-            # # 所有切片处理完成后，一次性保存所有结果
-            # if all_valid_clusters:
-            #     self.valid_clusters = all_valid_clusters
-            #     self._on_save_result_fs(only_valid=True)
-                    
-            # # 发送处理完成信号
-            # self.logger.info("全速处理完成所有切片")
-            # self.process_finished.emit(True)
             
         except Exception as e:
             self.logger.error(f"聚类处理出错: {str(e)}")
             self.process_finished.emit(False)
 
+    def _run_slice_task(self, slice_idx: int):
+        """在线程池中处理单个切片并记录结果
+        
+        每个任务使用独立的聚类处理器和预测器副本，避免共享可变状态。
+        
+        Args:
+            slice_idx: 切片索引
+        """
+        try:
+            cluster_processor = ClusterProcessor()
+            cluster_processor.set_cluster_params(self.epsilon_CF, self.epsilon_PW, self.min_pts)
+            predictor = self.predictor.clone()
+            result = self._process_slice(slice_idx, cluster_processor, predictor)
+        except Exception as e:
+            self.logger.error(f"处理切片数据时出错: {str(e)}")
+            result = ([], [])
+        
+        self._result_mutex.lock()
+        try:
+            self._slice_results[slice_idx] = result
+            self._finished_slice_count += 1
+            finished_count = self._finished_slice_count
+        finally:
+            self._result_mutex.unlock()
+        
+        # 向UI发送已完成的切片数量以刷新进度条，最后一个切片完成时必定发送
+        if finished_count % self._progress_emit_every == 0 or finished_count == self._total_slice_count:
+            self.current_slice_finished.emit(finished_count - 1)
+
+    def _process_slice(self, slice_idx: int, cluster_processor: ClusterProcessor,
+                       predictor: ModelPredictor) -> Tuple[list, list]:
+        """对单个切片进行聚类、识别并收集脉冲数据
+        
+        Args:
+            slice_idx: 切片索引
+            cluster_processor: 当前任务独占的聚类处理器
+            predictor: 当前任务独占的预测器
+            
+        Returns:
+            Tuple[list, list]: 当前切片的有效聚类结果，以及按列组织的脉冲数据块列表
+        """
+        # 获取当前切片
+        current_slice = self.slice_data[slice_idx]
+
+        # 数据完整性检查
+        if current_slice is None or len(current_slice) == 0:
+            self.logger.debug(f"切片 {slice_idx + 1} 数据无效")
+            return [], []
+
+        # 设置当前切片数据和时间范围
+        cluster_processor.set_data(current_slice, slice_idx)
+        cluster_processor.set_slice_time_ranges(self.processor.time_ranges)
+
+        # 初始化处理数据
+        shown_cluster_count = 0  # 当前切片中需要显示的聚类数量
+        slice_valid_clusters = []  # 当前切片中需要保存的有效聚类结果
+        current_data = current_slice
+        recycled_arrays = []  # 无效聚类的数据点，保持为数组避免逐点转换
+        dim_idx = {'CF': 0, 'PW': 0}
+        cluster_count = 0
+        cluster_count_by_save = 0
+        dimensions = ["CF", "PW"]
+        current_slice_pulse_data_valid = []
+        current_slice_pulse_data_invalid = []
+        current_slice_pulse_data_remaining = []
+        count_valid = 1
+        count_invalid = 1
+        count_remaining = 1
+
+        # 循环内频繁使用的属性和方法绑定为局部变量
+        compute_cluster_parameters = self.data_controller._compute_cluster_parameters
+        is_dtoa_concentrated = self.data_controller.params_extractor.is_dtoa_concentrated
+        build_pulse_block = self._build_pulse_block
+        build_cluster_pulse_block = self._build_cluster_pulse_block
+        pa_weight = self.pa_weight
+        dtoa_weight = self.dtoa_weight
+        weight_sum = pa_weight + dtoa_weight
+        only_show_identify_result = self.only_show_identify_result
+
+        # 按顺序处理每个维度
+        for dimension in dimensions:
+            success, cluster_result = cluster_processor.process_dimension(dimension, current_data)
+
+            if success and cluster_result:
+                # 确保每个cluster包含必要的字段，整个维度的聚类一次性批量预测
+                clusters = cluster_result['clusters']
+                cluster_data_list = [{
+                    'points': cluster['points'],
+                    'time_ranges': cluster_processor.time_ranges,
+                    'slice_idx': slice_idx,
+                    'dim_name': dimension,
+                    'cluster_idx': cluster_count + i + 1
+                } for i, cluster in enumerate(clusters)]
+                predictions = predictor.predict_batch(cluster_data_list)
+                # 当前维度下有效/无效聚类的脉冲数据及其切片内序号，维度处理完成后统一按列构建
+                valid_points, valid_in_slice_seqs = [], []
+                invalid_points, invalid_in_slice_seqs = [], []
+
+                # 处理聚类结果
+                for cluster, prediction in zip(clusters, predictions):
+                    success, pa_conf, dtoa_conf, pa_label, dtoa_label, pa_conf_dict, dtoa_conf_dict = prediction
+
+                    if success:
+                        # 提取有效雷达标签对应概率
+                        pa_conf_tmp = pa_conf if pa_label != 5 else 0.0
+                        dtoa_conf_tmp = dtoa_conf if dtoa_label != 4 else 0.0
+
+                        # 计算联合概率
+                        joint_prob = (pa_conf_tmp * pa_weight + dtoa_conf_tmp * dtoa_weight) / weight_sum
+
+                        # 判断是否为有效雷达信号（贪婪策略）
+                        is_valid = (pa_label != 5 or dtoa_label != 4)
+
+                        # 雷达有效时，对于脉间参差类别的特殊判别
+                        if is_valid and dtoa_label == 1:
+                            # DTOA范围过大且不集中于中位数附近时判为无效
+                            if not is_dtoa_concentrated(cluster['points'][:, 4]):
+                                is_valid = False
+
+                        # 创建聚类信息
+                        cluster_info = ClusterInfo(
+                            dim_name=dimension,
+                            cluster_dim_idx=dim_idx[dimension] + 1,  # 每个维度下的类别索引
+                            cluster_idx=shown_cluster_count + 1,  # 通过识别的聚类索引
+                            total_cluster_count=cluster_count + 1,  # 整体聚类结果中的索引
+                            is_valid=is_valid,  # 保存是否为有效雷达信号
+                            pa_label=pa_label,
+                            pa_conf=pa_conf,
+                            dtoa_label=dtoa_label,
+                            dtoa_conf=dtoa_conf,
+                            joint_prob=joint_prob,
+                            pa_dict=pa_conf_dict,
+                            dtoa_dict=dtoa_conf_dict,
+                            points=cluster['points'],
+                        )
+                        # 提取并更新参数
+                        (cluster_info.cf, cluster_info.pw,
+                         cluster_info.pri, cluster_info.doa) = compute_cluster_parameters(cluster['points'])
+
+                        # 微观保存脉冲数据：记录整个聚类的脉冲数据
+                        if is_valid:
+                            valid_points.append(cluster['points'])
+                            valid_in_slice_seqs.append(cluster_info.total_cluster_count)
+                        elif dimension == 'PW':
+                            # 仅在PW维度下收集无效脉冲数据，避免重复收集脉冲
+                            invalid_points.append(cluster['points'])
+                            invalid_in_slice_seqs.append(cluster_info.total_cluster_count)
+
+                        # 递增聚类序号
+                        cluster_count += 1
+
+                        # 宏观保存识别结果：收集所有结果
+                        if is_valid:
+                            cluster_count_by_save += 1
+                            # 将当前切片索引添加到cluster_info
+                            cluster_info.current_slice_idx = slice_idx
+                            cluster_info.cluster_idx_per_slice_to_save = cluster_count_by_save
+                            slice_valid_clusters.append(cluster_info)
+
+                        # 处理无效数据
+                        if not is_valid:
+                            recycled_arrays.append(cluster['points'])
+
+                        # 保存聚类结果
+                        if not only_show_identify_result or is_valid:
+                            dim_idx[dimension] += 1
+                            shown_cluster_count += 1
+
+                # 按列构建当前维度的脉冲数据块，序号按聚类顺序连续递增
+                if valid_points:
+                    current_slice_pulse_data_valid.append(build_cluster_pulse_block(
+                        valid_points, 'valid', dimension, count_valid, valid_in_slice_seqs))
+                    count_valid += len(valid_points)
+                if invalid_points:
+                    current_slice_pulse_data_invalid.append(build_cluster_pulse_block(
+                        invalid_points, 'invalid', dimension, count_invalid, invalid_in_slice_seqs))
+                    count_invalid += len(invalid_points)
+
+                # 更新待处理数据
+                unprocessed_data = np.asarray(cluster_result.get('unprocessed_points', []))
+
+                # 合并回收数据和未聚类数据
+                # 对于CF维度，无效数据和未聚类数据合并，对于PW维度，只保留未聚类数据（因为无效数据已经保存过了）
+                if dimension == 'CF':
+                    if recycled_arrays:
+                        if len(unprocessed_data) > 0:
+                            current_data = np.vstack(recycled_arrays + [unprocessed_data])
+                        else:
+                            current_data = np.vstack(recycled_arrays)
+                    else:
+                        current_data = unprocessed_data
+                elif dimension == 'PW':
+                    current_data = unprocessed_data
+
+        # 处理当前切片最终的剩余脉冲
+        if current_data is not None and len(current_data) > 0:
+            # current_data 始终为NumPy数组，单个脉冲数据按一行处理后整体按列构建
+            remaining_points = np.atleast_2d(current_data)
+
+            # 检查数据维度是否正确
+            if remaining_points.ndim == 2 and remaining_points.shape[1] >= 5:
+                current_slice_pulse_data_remaining.append(build_pulse_block(
+                    remaining_points, 'remaining', '——', '——', '——'))
+            else:
+                self.logger.warning(f"切片 {slice_idx + 1} 的剩余脉冲数据格式不正确，无法保存。Shape: {current_data.shape}")
+
+        # 返回当前切片的有效聚类结果和脉冲数据
+        pulse_blocks = current_slice_pulse_data_valid + current_slice_pulse_data_invalid + current_slice_pulse_data_remaining
+        if pulse_blocks:
+            self.logger.info(f"切片 {slice_idx + 1} 存在脉冲数据")
+        else:
+            self.logger.info(f"切片 {slice_idx + 1} 没有脉冲数据")
+        return slice_valid_clusters, pulse_blocks
+
 
-    def _on_save_result_fs(self, only_valid: bool = False) -> Tuple[bool, str]:
-        """保存识别结果到Excel文件
+    @staticmethod
+    def _build_pulse_block(points: np.ndarray, category: str, dim_name: str,
+                           seq, in_slice_seq) -> dict:
+        """按列构建一组脉冲的保存数据
+        
+        Args:
+            points: 脉冲数据数组，形状为(N, >=5)，列依次为载频、脉宽、方位角、幅度、到达时间
+            category: 类别（valid/invalid/remaining）
+            dim_name: 聚类维度
+            seq: 序号
+            in_slice_seq: 切片内序号
+            
+        Returns:
+            dict: 列名到列数组的映射，到达时间差以组内第一个脉冲为0，单位us
+        """
+        n = len(points)
+        toa = points[:, 4]
+        return {
+            '类别': np.full(n, category),
+            '聚类维度': np.full(n, dim_name),
+            '序号': np.full(n, seq),
+            '切片内序号': np.full(n, in_slice_seq),
+            '载频': points[:, 0],
+            '脉宽': points[:, 1],
+            '方位角': points[:, 2],
+            '幅度': points[:, 3],
+            '到达时间': toa,
+            '到达时间差': np.diff(toa, prepend=toa[0]) * 1000,
+        }
+
+    @staticmethod
+    def _build_cluster_pulse_block(points_list: list, category: str, dim_name: str,
+                                   first_seq: int, in_slice_seqs: list) -> dict:
+        """按列构建同一维度下多个聚类的脉冲保存数据
+        
+        Args:
+            points_list: 各聚类的脉冲数据数组列表，形状均为(N_i, >=5)
+            category: 类别（valid/invalid）
+            dim_name: 聚类维度
+            first_seq: 第一个聚类的序号，后续聚类依次递增
+            in_slice_seqs: 各聚类的切片内序号
+            
+        Returns:
+            dict: 列名到列数组的映射，到达时间差以每个聚类的第一个脉冲为0，单位us
+        """
+        sizes = np.fromiter((len(points) for points in points_list), dtype=np.int64, count=len(points_list))
+        points = np.vstack(points_list)
+        toa = points[:, 4]
+        dtoa = np.diff(toa, prepend=toa[0]) * 1000
+        # 每个聚类的第一个脉冲不与上一个聚类做差
+        dtoa[np.cumsum(sizes[:-1])] = 0
+        return {
+            '类别': np.full(len(points), category),
+            '聚类维度': np.full(len(points), dim_name),
+            '序号': np.repeat(np.arange(first_seq, first_seq + len(points_list)), sizes),
+            '切片内序号': np.repeat(np.asarray(in_slice_seqs), sizes),
+            '载频': points[:, 0],
+            '脉宽': points[:, 1],
+            '方位角': points[:, 2],
+            '幅度': points[:, 3],
+            '到达时间': toa,
+            '到达时间差': dtoa,
+        }
+
+    def _wait_for_save(self, future: Optional[Future], description: str) -> bool:
+        """等待保存任务完成
         
         Args:
-            only_valid (bool, optional): 是否只保存有效的雷达信号结果。默认为False。
+            future: 保存任务，为None表示未提交
+            description: 保存内容描述，用于日志
             
         Returns:
-            Tuple[bool, str]: 是否成功，以及相关消息
+            bool: 是否保存成功
         """
+        if future is None:
+            return False
         try:
-            self.logger.info(f"开始保存全速处理识别结果到目录: {self.save_dir}")
+            file_path = future.result()
+            self.logger.info(f"全速处理{description}已保存到: {file_path}")
+            return True
+        except Exception as e:
+            self.logger.error(f"保存{description}出错: {str(e)}")
+            return False
+
+    def _on_save_result_fs(self) -> Optional[Future]:
+        """提交识别结果的Excel写入任务
+        
+        保存valid_clusters中的全部聚类，是否只保留有效雷达信号已在识别时
+        由only_show_identify_result决定。
+        
+        Returns:
+            Optional[Future]: 写入任务，结果为保存路径；没有可保存的结果或出错时返回None
+        """
+        try:
+            # pandas仅在保存结果时使用，延迟导入以缩短程序启动时间
+            import pandas as pd
             
-            # 创建保存目录
-            if not os.path.exists(self.save_dir):
-                os.makedirs(self.save_dir, exist_ok=True)
+            self.logger.info(f"开始保存全速处理识别结果到目录: {self.save_dir}")
                 
             # 从原始文件路径提取数据包名称
             if self.last_file_path:
@@ -532,50 +683,34 @@ class FullSpeedWorker(QThread):
                 
             file_path = os.path.join(self.save_dir, file_name)
             
-            # 准备数据
-            results_data = []
-            
-            # 遍历所有切片的识别结果
-            for cluster_idx, cluster_result in enumerate(self.valid_clusters):
-                # 如果只保存有效结果，则检查是否为有效雷达信号
-                # if only_valid:
-                #     # 直接使用保存在聚类结果中的is_valid标志
-                #     is_valid = cluster_result.get('is_valid', False)
-                    
-                #     # 如果为无效结果且只保存有效结果，则跳过此条
-                #     if not is_valid:
-                #         continue
-                
-                # 提取需要保存的数据
-                dim_name = cluster_result.get('dim_name', '')
-                prediction = cluster_result.get('prediction', {})
-                
-                row_data = {
-                    '切片索引': cluster_result.get('current_slice_idx', 0) + 1,
-                    '雷达序号': cluster_result.get('cluster_idx_per_slice_to_save', 0),
-                    # '雷达序号': cluster_idx + 1,
-                    '聚类ID': cluster_result.get('total_cluster_count', 0),
-                    '聚类维度': dim_name,
-                    '载频/MHz': f"{', '.join([f'{v:.0f}' for v in cluster_result.get('CF', [])])}",  # 载频，多值用逗号分隔
-                    '脉宽/us': f"{', '.join([f'{v:.1f}' for v in cluster_result.get('PW', [])])}",  # 脉宽，多值用逗号分隔
-                    'DOA/°': f"{np.mean(cluster_result.get('DOA', [])):.0f}",  # DOA取均值
-                    'PRI/us': f"{', '.join([f'{v:.1f}' for v in cluster_result.get('PRI', [])])}",  # PRI，多值用逗号分隔
-                    'PA预测结果': self.PA_LABEL_NAMES.get(prediction.get('pa_label', 5), '未知'),
-                    'PA预测概率':  f"{'\n'.join([
-                        f'{self.PA_LABEL_NAMES[label]}: {conf:.4f}' 
-                        for label, conf in prediction.get('pa_dict', {}).items()
-                    ])}",
-                    'DTOA预测结果': self.DTOA_LABEL_NAMES.get(prediction.get('dtoa_label', 4), '未知'),
-                    'DTOA预测概率':  f"{'\n'.join(
-                        [f'{self.DTOA_LABEL_NAMES[label]}: {conf:.4f}' 
-                         for label, conf in prediction.get('dtoa_dict', {}).items()])}",
-                }
-                
-                results_data.append(row_data)
+            # 准备数据：按列直接构建，避免逐行创建字典
+            clusters = self.valid_clusters
+            cluster_count = len(clusters)
+            pa_label_names = self.PA_LABEL_NAMES
+            dtoa_label_names = self.DTOA_LABEL_NAMES
             
             # 创建DataFrame并保存
-            if results_data:
-                df = pd.DataFrame(results_data)
+            if cluster_count:
+                df = pd.DataFrame({
+                    '切片索引': np.fromiter((c.current_slice_idx + 1 for c in clusters), dtype=np.int64, count=cluster_count),
+                    '雷达序号': np.fromiter((c.cluster_idx_per_slice_to_save for c in clusters), dtype=np.int64, count=cluster_count),
+                    '聚类ID': np.fromiter((c.total_cluster_count for c in clusters), dtype=np.int64, count=cluster_count),
+                    '聚类维度': [c.dim_name for c in clusters],
+                    '载频/MHz': [', '.join([f'{v:.0f}' for v in c.cf]) for c in clusters],  # 载频，多值用逗号分隔
+                    '脉宽/us': [', '.join([f'{v:.1f}' for v in c.pw]) for c in clusters],  # 脉宽，多值用逗号分隔
+                    'DOA/°': [f"{np.mean(c.doa):.0f}" for c in clusters],  # DOA取均值
+                    'PRI/us': [', '.join([f'{v:.1f}' for v in c.pri]) for c in clusters],  # PRI，多值用逗号分隔
+                    'PA预测结果': [pa_label_names.get(c.pa_label, '未知') for c in clusters],
+                    'PA预测概率': ['\n'.join(
+                        _format_label_prob(pa_label_names[label], float(conf))
+                        for label, conf in c.pa_dict.items()
+                    ) for c in clusters],
+                    'DTOA预测结果': [dtoa_label_names.get(c.dtoa_label, '未知') for c in clusters],
+                    'DTOA预测概率': ['\n'.join(
+                        _format_label_prob(dtoa_label_names[label], float(conf))
+                        for label, conf in c.dtoa_dict.items()
+                    ) for c in clusters],
+                })
                 
                 # 准备参数信息表
                 params_info = {
@@ -585,33 +720,28 @@ class FullSpeedWorker(QThread):
                 params_df = pd.DataFrame(params_info)
                 
                 # 直接创建或覆盖文件，不使用追加模式
-                with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                    df.to_excel(writer, sheet_name='识别结果', index=False)
-                    params_df.to_excel(writer, sheet_name='参数信息', index=False)
-                
-                self.logger.info(f"全速处理识别结果已保存到: {file_path}")
-                return True, f"成功保存{len(results_data)}条识别结果"
+                return submit_excel_write(file_path, [('识别结果', df), ('参数信息', params_df)])
             else:
-                return False, "没有有效的识别结果可保存"
+                self.logger.warning("没有有效的识别结果可保存")
+                return None
                 
         except Exception as e:
             self.logger.error(f"保存识别结果出错: {str(e)}")
             import traceback
             self.logger.error(f"错误堆栈:\n{traceback.format_exc()}")
-            return False, f"保存失败: {str(e)}"
+            return None
         
-    def _on_save_pulse_data_fs(self):
-        """保存每个切片的详细脉冲数据到Excel文件
+    def _on_save_pulse_data_fs(self) -> Optional[Future]:
+        """提交每个切片详细脉冲数据的Excel写入任务
 
         Returns:
-            Tuple[bool, str]: 是否成功，以及相关消息
+            Optional[Future]: 写入任务，结果为保存路径；没有脉冲数据或出错时返回None
         """
         try:
-            self.logger.info(f"开始保存全速处理脉冲数据到目录: {self.save_dir}")
+            # pandas仅在保存结果时使用，延迟导入以缩短程序启动时间
+            import pandas as pd
 
-            # 创建保存目录
-            if not os.path.exists(self.save_dir):
-                os.makedirs(self.save_dir, exist_ok=True)
+            self.logger.info(f"开始保存全速处理脉冲数据到目录: {self.save_dir}")
 
             # 从原始文件路径提取数据包名称
             if self.last_file_path:
@@ -626,39 +756,52 @@ class FullSpeedWorker(QThread):
             file_path = os.path.join(self.save_dir, file_name)
 
             # 检查是否有脉冲数据可保存
-            if not hasattr(self, 'all_pulse_data_by_slice') or not self.all_pulse_data_by_slice:
+            if not any(self.all_pulse_data_by_slice):
                 self.logger.warning("没有收集到脉冲数据可供保存。")
-                return False, "没有脉冲数据可保存"
+                return None
             
-            # 使用 ExcelWriter 写入多个sheet
-            with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                # 按照切片索引排序写入
-                sorted_slice_indices = sorted(self.all_pulse_data_by_slice.keys())
-                for slice_idx in sorted_slice_indices:
-                    pulse_data_list = self.all_pulse_data_by_slice[slice_idx]
-                    if pulse_data_list: # 确保列表不为空
-                        # 创建DataFrame
-                        df = pd.DataFrame(pulse_data_list)
-                        # 确保列顺序
-                        column_order = ['类别', '聚类维度', '序号', '切片内序号', '载频', '脉宽', '方位角', '幅度', '到达时间', '到达时间差']
-                        # 检查DataFrame是否包含所有必须列
-                        if all(col in df.columns for col in column_order):
-                            # 重新排列列顺序
-                            df = df[column_order]
-                        else:
-                            missing_cols = [col for col in column_order if col not in df.columns]
-                            self.logger.warning(f"切片 {slice_idx + 1} 的脉冲数据DataFrame缺少列: {missing_cols}")
-                        # 写入空列
-                        sheet_name = f'Slice_{slice_idx + 1}'
-                        df.to_excel(writer, sheet_name=sheet_name, index=False)
+            # 默认每个切片一个sheet，否则所有切片加上切片列后合并写入同一sheet
+            sheets = []
+            merged_frames = []
+            column_order = ['类别', '聚类维度', '序号', '切片内序号', '载频', '脉宽', '方位角', '幅度', '到达时间', '到达时间差']
+            # 按照切片索引顺序写入
+            for slice_idx, pulse_blocks in enumerate(self.all_pulse_data_by_slice):
+                if pulse_blocks: # 确保列表不为空
+                    # 按列数据块创建DataFrame
+                    df = pd.concat([pd.DataFrame(block) for block in pulse_blocks], ignore_index=True)
+                    # 检查DataFrame是否包含所有必须列
+                    if all(col in df.columns for col in column_order):
+                        # 重新排列列顺序
+                        df = df[column_order]
                     else:
-                        self.logger.debug(f"切片 {slice_idx + 1} 没有脉冲数据可保存。")
-
-            self.logger.info(f"全速处理脉冲数据已保存到: {file_path}")
-            return True, f"成功保存脉冲数据"
+                        missing_cols = [col for col in column_order if col not in df.columns]
+                        self.logger.warning(f"切片 {slice_idx + 1} 的脉冲数据DataFrame缺少列: {missing_cols}")
+                    if self.one_sheet_per_slice:
+                        sheets.append((f'Slice_{slice_idx + 1}', df))
+                    else:
+                        df.insert(0, '切片', slice_idx + 1)
+                        merged_frames.append(df)
+                else:
+                    self.logger.debug(f"切片 {slice_idx + 1} 没有脉冲数据可保存。")
+
+            if merged_frames:
+                all_df = pd.concat(merged_frames, ignore_index=True)
+                # 超出单个sheet行数上限时按顺序拆分到多个sheet
+                max_data_rows = EXCEL_MAX_ROWS - 1
+                if len(all_df) <= max_data_rows:
+                    sheets.append(('脉冲数据', all_df))
+                else:
+                    for part_idx, start in enumerate(range(0, len(all_df), max_data_rows)):
+                        sheets.append((f'脉冲数据_{part_idx + 1}', all_df.iloc[start:start + max_data_rows]))
+
+            if not sheets:
+                self.logger.warning("没有脉冲数据可保存。")
+                return None
+
+            return submit_excel_write(file_path, sheets)
         
         except Exception as e:
             self.logger.error(f"保存脉冲数据出错: {str(e)}")
             import traceback
             self.logger.error(f"错误堆栈:\n{traceback.format_exc()}")
-            return False, f"保存脉冲数据失败: {str(e)}"
+            return None
@@ -20,7 +20,8 @@ class ClusterProcessor:
         epsilon_PW (float): PW维度邻域半径
         min_pts (int): 最小点数
         points (Optional[NDArray]): 当前处理的数据点
-        processed_points (set): 已处理的数据点索引集合
+        processed_mask (NDArray[bool]): 已处理的数据点掩码
+        toa (Optional[NDArray]): 当前数据点的TOA列，C连续的一维数组
         time_ranges (List): 时间范围列表
         current_band (str): 当前波段标识
     """
@@ -41,7 +42,8 @@ class ClusterProcessor:
         
         # 数据点
         self.points = None  # 当前处理的数据点
-        self.processed_points = set()  # 已处理的数据点索引
+        self.processed_mask = np.zeros(0, dtype=bool)  # 已处理的数据点掩码
+        self.toa = None  # 当前数据点的连续TOA列
         
         # 日志管理器
         self.logger = LogManager()
@@ -89,17 +91,49 @@ class ClusterProcessor:
             sliced_data (List[NDArray]): 当前切片的数据点列表
             sliced_data_idx (int): 切片索引
         """
-        if isinstance(sliced_data, np.ndarray):
-            self.sliced_data = sliced_data
-        else:
-            self.sliced_data = np.array(sliced_data)
+        # 已是float64的C连续数组时不复制
+        self.sliced_data = np.ascontiguousarray(sliced_data, dtype=np.float64)
         self.current_slice_idx = sliced_data_idx
         self.current_dim = 0
-        self.processed_points = set()
+        self.processed_mask = np.zeros(0, dtype=bool)
 
-    def _cluster_cf_dimension(self) -> List[Dict]:
-        """CF维度聚类
+    @staticmethod
+    def _group_label_indices(labels: NDArray) -> List[NDArray]:
+        """按聚类标签对数据点索引分组
         
+        稳定排序后一次性切分出所有类别的索引，组内索引保持升序，噪声点（-1）不参与分组。
+        类别标签与分组边界直接由排序结果得到，不再对标签重复排序。
+        
+        Args:
+            labels (NDArray): 聚类标签
+            
+        Returns:
+            List[NDArray]: 按标签升序排列的各类别数据点索引
+        """
+        if len(labels) == 0:
+            return []
+        order = np.argsort(labels, kind='stable')
+        labels_sorted = labels[order]
+        
+        # 标签变化处即为各类别的起始位置
+        change = np.empty(len(labels_sorted), dtype=bool)
+        change[0] = True
+        np.not_equal(labels_sorted[1:], labels_sorted[:-1], out=change[1:])
+        unique_labels = labels_sorted[change]
+        starts = np.flatnonzero(change)
+        
+        groups = np.split(order, starts[1:])
+        return [group for label, group in zip(unique_labels, groups) if label != -1]
+
+    def _cluster_dimension(self, dim_idx: int, epsilon: float, dim_name: str, idx_offset: int = 0) -> List[Dict]:
+        """对指定维度进行聚类，CF与PW维度共用
+        
+        Args:
+            dim_idx (int): 聚类维度列索引（0:CF, 1:PW）
+            epsilon (float): 邻域半径
+            dim_name (str): 维度名称
+            idx_offset (int): 聚类编号偏移量，PW维度从CF维度聚类数量之后继续编号
+            
         Returns:
             List[Dict]: 聚类结果列表，每个字典包含聚类的详细信息：
                 - points: 数据点
@@ -110,123 +144,107 @@ class ClusterProcessor:
                 - slice_idx: 切片索引
                 - time_ranges: 时间范围
         """
-        try:
-            # 创建聚类器
-            clusterer = RoughClusterer(self.epsilon_CF, self.min_pts)
-            
-            # 进行聚类
-            # labels = clusterer.fit(self.points, 0)  # CF维度
-            labels = clusterer.fit_dbscan(self.points, 0)  # CF维度
-            
-            # 处理聚类结果
-            clusters = []
-            unique_labels = np.unique(labels)
-            
-            for label in unique_labels:
-                if label == -1:  # 跳过噪声点
-                    continue
-                    
-                # 获取当前类别的点索引
-                mask = (labels == label)
-                cluster_points = self.points[mask]
+        # 创建聚类器
+        clusterer = RoughClusterer(epsilon, self.min_pts)
+        
+        # 进行聚类，只传入聚类维度的连续一维数组
+        # labels = clusterer.fit(self.points, dim_idx)
+        labels = clusterer.fit_dbscan(np.ascontiguousarray(self.points[:, dim_idx]))
+        
+        # 处理聚类结果
+        groups = self._group_label_indices(labels)
+        if not groups:
+            return []
+        
+        # 按类别数量预分配结果列表，按序填入后截断
+        clusters = [None] * len(groups)
+        cluster_count = 0
+        is_kept = np.zeros(len(groups), dtype=bool)
+        
+        # 按类别顺序一次性取出所有数据点，各类别的数据点为其中的连续切片
+        group_sizes = np.fromiter((len(group) for group in groups), dtype=np.int64, count=len(groups))
+        group_ends = np.cumsum(group_sizes)
+        group_starts = group_ends - group_sizes
+        indices_grouped = np.concatenate(groups)
+        points_grouped = self.points[indices_grouped]
+        toa_grouped = self.toa[indices_grouped]
+        
+        # 仅小类别需要提取DTOA，预分配缓冲区后各类别复用，末尾补0以补齐长度
+        dtoa_buffer = np.empty(self.MIN_CLUSTER_SIZE + 1, dtype=np.float64)
+        
+        for group_idx, (points_indices, start, end) in enumerate(zip(groups, group_starts, group_ends)):
+            # 获取当前类别的数据点
+            cluster_points = points_grouped[start:end]
 
-                dtoa = np.diff(cluster_points[:, 4], prepend=0) * 1000  # 转换为us
-                dtoa = np.append(dtoa, 0)  # 补齐长度
+            # 检查聚类大小与PRI有效性，点数足够的类别无需提取DTOA
+            cluster_size = len(cluster_points)
+            if cluster_size <= self.MIN_CLUSTER_SIZE:
+                # 第一个值为首个到达时间，转换为us
+                toa = toa_grouped[start:end]
+                dtoa = dtoa_buffer[:cluster_size + 1]
+                dtoa[0] = toa[0]
+                np.subtract(toa[1:], toa[:-1], out=dtoa[1:cluster_size])
+                dtoa[cluster_size] = 0
+                dtoa *= 1000
                 is_valid_dtoa = self.params_extractor.extract_grouped_values(dtoa, eps=0.2, min_samples=4, threshold_ratio=0.1)
-                
-                # 检查聚类大小与PRI有效性
-                if len(cluster_points) <= self.MIN_CLUSTER_SIZE and not is_valid_dtoa:
-                    continue
-                else:
-                    # 记录已处理的点
-                    points_indices = np.where(mask)[0]
-                    self.processed_points.update(points_indices)
-                    
-                    # 创建聚类结果字典
-                    cluster_info = {
-                        'points': cluster_points,
-                        'points_indices': points_indices,
-                        'cluster_size': len(cluster_points),
-                        'cluster_idx': len(clusters) + 1,
-                        'dim_name': 'CF',
-                        'slice_idx': self.current_slice_idx + 1,
-                        'time_ranges': self.time_ranges
-                    }
-                    clusters.append(cluster_info)
-                    self.logger.info(f"切片{cluster_info['slice_idx']}{cluster_info['dim_name']}维类别{cluster_info['cluster_idx']} - 点数: {cluster_info['cluster_size']}")
+            else:
+                is_valid_dtoa = True
             
-            self.CF_CLUSTER_COUNT = len(clusters)
+            if not is_valid_dtoa:
+                continue
+            else:
+                # 记录已处理的类别
+                is_kept[group_idx] = True
+                
+                # 创建聚类结果字典
+                cluster_info = {
+                    'points': cluster_points,
+                    'points_indices': points_indices,
+                    'cluster_size': cluster_size,
+                    'cluster_idx': cluster_count + 1 + idx_offset,
+                    'dim_name': dim_name,
+                    'slice_idx': self.current_slice_idx + 1,
+                    'time_ranges': self.time_ranges
+                }
+                clusters[cluster_count] = cluster_info
+                cluster_count += 1
+                self.logger.info("切片%d%s维类别%d - 点数: %d", cluster_info['slice_idx'], dim_name,
+                                 cluster_info['cluster_idx'], cluster_info['cluster_size'])
+        
+        # 一次性标记所有保留类别的数据点
+        self.processed_mask[indices_grouped[np.repeat(is_kept, group_sizes)]] = True
+        del clusters[cluster_count:]
+
+        return clusters
 
+    def _cluster_cf_dimension(self) -> List[Dict]:
+        """CF维度聚类
+        
+        Returns:
+            List[Dict]: 聚类结果列表，格式见_cluster_dimension
+        """
+        try:
+            clusters = self._cluster_dimension(0, self.epsilon_CF, 'CF')
+            self.CF_CLUSTER_COUNT = len(clusters)
             return clusters
             
         except Exception as e:
-            self.logger.error(f"CF维度聚类出错: {str(e)}")
+            self.logger.error("CF维度聚类出错: %s", e)
             return []
 
     def _cluster_pw_dimension(self) -> List[Dict]:
         """PW维度聚类
         
         Returns:
-            List[Dict]: 聚类结果列表，每个字典包含聚类的详细信息：
-                - points: 聚类中的数据点
-                - points_indices: 数据点索引
-                - cluster_size: 聚类大小
-                - cluster_idx: 聚类编号
-                - dim_name: 维度名称
-                - slice_idx: 切片索引
-                - time_ranges: 时间范围
+            List[Dict]: 聚类结果列表，格式见_cluster_dimension，聚类编号接续CF维度
         """
         try:
-            # 创建聚类器
-            clusterer = RoughClusterer(self.epsilon_PW, self.min_pts)
-            
-            # 进行聚类
-            # labels = clusterer.fit(self.points, 1)  # PW维度
-            labels = clusterer.fit_dbscan(self.points, 1)  # PW维度
-            
-            # 处理聚类结果
-            clusters = []
-            unique_labels = np.unique(labels)
-            
-            for label in unique_labels:
-                if label == -1:  # 跳过噪声点
-                    continue
-                    
-                # 获取当前类别的点索引
-                mask = (labels == label)
-                cluster_points = self.points[mask]
-
-                dtoa = np.diff(cluster_points[:, 4], prepend=0) * 1000  # 转换为us
-                dtoa = np.append(dtoa, 0)  # 补齐长度
-                is_valid_dtoa = self.params_extractor.extract_grouped_values(dtoa, eps=0.2, min_samples=4, threshold_ratio=0.1)
-
-                # 检查聚类大小与PRI有效性
-                if len(cluster_points) <= self.MIN_CLUSTER_SIZE and not is_valid_dtoa:
-                    continue
-                else:
-                    # 记录已处理的点
-                    points_indices = np.where(mask)[0]
-                    self.processed_points.update(points_indices)
-                    
-                    # 创建聚类结果字典
-                    cluster_info = {
-                        'points': cluster_points,
-                        'points_indices': points_indices,
-                        'cluster_size': len(cluster_points),
-                        'cluster_idx': len(clusters) + 1 + self.CF_CLUSTER_COUNT,
-                        'dim_name': 'PW',
-                        'slice_idx': self.current_slice_idx + 1,
-                        'time_ranges': self.time_ranges
-                    }
-                    clusters.append(cluster_info)
-                    self.logger.info(f"切片{cluster_info['slice_idx']}{cluster_info['dim_name']}维类别{cluster_info['cluster_idx']} - 点数: {cluster_info['cluster_size']}")
-            
-            self.logger.info(f"{'='*50}\n")
-            
+            clusters = self._cluster_dimension(1, self.epsilon_PW, 'PW', self.CF_CLUSTER_COUNT)
+            self.logger.info("%s\n", '=' * 50)
             return clusters
             
         except Exception as e:
-            self.logger.error(f"PW维度聚类出错: {str(e)}")
+            self.logger.error("PW维度聚类出错: %s", e)
             return []
 
     def _get_unprocessed_points(self) -> List[NDArray]:
@@ -235,15 +253,11 @@ class ClusterProcessor:
             if self.points is None:
                 return []
             
-            # 获取所有未处理点的索引
-            all_indices = set(range(len(self.points)))
-            unprocessed_indices = list(all_indices - self.processed_points)
-            
-            # 返回未处理的点
-            return self.points[unprocessed_indices]
+            # 返回未处理的点，保持原有顺序
+            return self.points[~self.processed_mask]
             
         except Exception as e:
-            self.logger.error(f"获取未处理点出错: {str(e)}")
+            self.logger.error("获取未处理点出错: %s", e)
             return []
 
     def detect_band(self, data: np.ndarray) -> str:
@@ -259,20 +273,21 @@ class ClusterProcessor:
             ValueError: 当输入数据无效时抛出
         """
         try:
-            # 确保数据是numpy数组
-            data = np.array(data)
+            # 确保数据是numpy数组，已是数组时不复制
+            data = np.asarray(data)
             # 获取CF维度数据（第一列）
-            cf_data = data[:, 0] if len(data.shape) > 1 else data
-            
-            cf_min = np.min(cf_data)
-            cf_max = np.max(cf_data)
+            cf_data = data[:, 0] if data.ndim > 1 else data
             
-            if 8000 <= cf_min <= 12000 and cf_max <= 12000:
+            # 最小值不在X波段范围内时无需再求最大值
+            cf_min = cf_data.min()
+            if not 8000 <= cf_min <= 12000:
+                return "其他波段"
+            if cf_data.max() <= 12000:
                 return "X波段"
             return "其他波段"
             
         except Exception as e:
-            self.logger.error(f"波段检测出错: {str(e)}")
+            self.logger.error("波段检测出错: %s", e)
             return "其他波段"
 
     def process_dimension(self, dimension: str, data: np.ndarray) -> Tuple[bool, Optional[Dict]]:
@@ -294,17 +309,20 @@ class ClusterProcessor:
             if dimension not in self.DIM_NAMES:
                 raise ValueError(f"无效的维度名称: {dimension}")
             
-            # 确保数据是numpy数组
-            self.points = np.array(data) if not isinstance(data, np.ndarray) else data
-            self.processed_points = set()
+            # 确保数据是C连续的float64数组，已满足时不复制，保证后续按列取值为连续访问
+            self.points = np.ascontiguousarray(data, dtype=np.float64)
+            n_points = len(self.points)
+            self.processed_mask = np.zeros(n_points, dtype=bool)
+            # TOA列单独取出为连续数组，各类别的DTOA计算不再跨列访问
+            self.toa = np.ascontiguousarray(self.points[:, 4]) if n_points else np.zeros(0)
             
             # 使用当前切片的时间范围
             if self.slice_time_ranges and self.current_slice_idx < len(self.slice_time_ranges):
                 self.time_ranges = self.slice_time_ranges[self.current_slice_idx]
             else:
-                self.logger.warning(f"切片{self.current_slice_idx}的时间范围未设置")
+                self.logger.warning("切片%d的时间范围未设置", self.current_slice_idx)
                 # 如果没有设置时间范围，则使用数据中的时间范围
-                if len(self.points) > 0:
+                if n_points > 0:
                     self.time_ranges = [self.points[0][4], self.points[-1][4]]
             
             # 根据维度选择聚类方法
@@ -323,7 +341,7 @@ class ClusterProcessor:
             return False, None
             
         except Exception as e:
-            self.logger.error(f"{dimension}维度处理出错: {str(e)}")
+            self.logger.error("%s维度处理出错: %s", dimension, e)
             return False, None
 
     def set_slice_time_ranges(self, time_ranges: list):
@@ -1,9 +1,19 @@
+import hashlib
+import importlib.util
+import os
+import sys
 import numpy as np
-import pandas as pd
 from pathlib import Path
 from .log_manager import LogManager
 from .plot_manager import SignalPlotter
 
+# 读取Excel优先使用更快的calamine引擎，未安装时使用pandas默认引擎
+EXCEL_READ_ENGINE = 'calamine' if importlib.util.find_spec('python_calamine') is not None else None
+
+# Excel解析缓存目录，位于项目根目录（打包后为程序所在目录）的temp下，与启动时的工作目录无关
+_APP_ROOT = Path(sys.executable).parent if getattr(sys, 'frozen', False) else Path(__file__).resolve().parent.parent
+EXCEL_CACHE_DIR = _APP_ROOT / "temp" / "excel_cache"
+
 class DataProcessor:
     """数据处理器
     
@@ -17,8 +27,12 @@ class DataProcessor:
         time_ranges (List[Tuple[float, float]]): 每个切片的时间范围列表
         plotter (SignalPlotter): 信号绘图器实例
         logger (LogManager): 日志管理器实例
+        cache_dir (Path): Excel解析结果缓存目录，默认为EXCEL_CACHE_DIR
     """
     
+    EXCEL_COLUMNS = [1, 2, 4, 5, 7]  # 依次为CF、PW、DOA、PA、TOA所在列
+    EXCEL_CACHE_MAX_FILES = 8  # Excel解析缓存最多保留的文件数
+    
     def __init__(self):
         # 基础参数设置
         self.slice_length = 250  # 250ms
@@ -28,6 +42,7 @@ class DataProcessor:
         self.time_ranges = []
         self.plotter = SignalPlotter()
         self.logger = LogManager()
+        self.cache_dir = EXCEL_CACHE_DIR
         
     def load_excel_file(self, file_path: str) -> tuple[bool, str, int, str]:
         """加载Excel文件并进行初始预处理
@@ -56,33 +71,19 @@ class DataProcessor:
         try:
             self.logger.info(f"开始加载Excel文件: {file_path}")
             
-            # 读取Excel文件
-            df = pd.read_excel(file_path)
-            self.logger.debug(f"Excel文件读取成功，原始数据形状: {df.shape}")
+            # 读取Excel文件中需要的列
+            data_tmp = self._read_excel_columns(file_path)
+            self.logger.debug(f"Excel文件读取成功，原始数据形状: {data_tmp.shape}")
             
-            # 数据格式重排和单位转换
-            data_tmp = df.values
-            CF = data_tmp[:, 1]                 # MHz
-            PW = data_tmp[:, 2]                 # us
-            DOA = data_tmp[:, 4]                # 度
-            PA = data_tmp[:, 5]                 # dB
-            TOA = data_tmp[:, 7] / 1e4          # 转换为ms
-            
-            # 确保数据单位与预测要求一致
-            self.data = np.column_stack((
-                CF,     # MHz
-                PW,     # us
-                DOA,    # 度
-                PA,     # dB
-                TOA     # ms
-            ))
-            self.logger.debug(f"数据重排后形状: {self.data.shape}")
-            
-            # 剔除错误数据
-            original_length = len(self.data)
-            self.data = self.data[self.data[:,3] != 255]  # 剔除PA无效值
+            # 剔除错误数据：先在原始PA列上计算掩码，只为保留的数据分配一次C连续数组
+            original_length = len(data_tmp)
+            self.data = data_tmp[data_tmp[:, 3] != 255]  # 剔除PA无效值
             filtered_length = len(self.data)
             self.logger.info(f"剔除无效PA值后，数据量从{original_length}减少到{filtered_length}")
+            
+            # 单位转换，列依次为 CF(MHz)、PW(us)、DOA(度)、PA(dB)、TOA(ms)
+            self.data[:, 4] /= 1e4  # TOA转换为ms
+            self.logger.debug(f"数据重排后形状: {self.data.shape}")
 
             time_data = self.data[:, self.slice_dim]
             
@@ -101,6 +102,71 @@ class DataProcessor:
             self.logger.error(f"数据加载失败: {str(e)}")
             return False, f"数据加载失败: {str(e)}", 0, None
         
+    def _read_excel_columns(self, file_path: str) -> np.ndarray:
+        """读取Excel文件中CF、PW、DOA、PA、TOA所在的列
+        
+        只解析需要的列，解析结果按文件路径、修改时间和大小缓存为cache_dir下的.npy文件，
+        再次加载未修改的文件时直接读取缓存。同一文件只保留最新版本的缓存，
+        缓存总数超过EXCEL_CACHE_MAX_FILES时删除最久未使用的缓存。
+        
+        Args:
+            file_path (str): Excel文件路径
+            
+        Returns:
+            np.ndarray: 形状为(N, 5)的数组，各列为原始单位的CF、PW、DOA、PA、TOA
+        """
+        stat = os.stat(file_path)
+        # 缓存文件名由文件路径和文件版本（修改时间、大小）两部分哈希组成
+        path_key = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()[:16]
+        version_key = hashlib.sha1(f"{stat.st_mtime_ns}|{stat.st_size}".encode('utf-8')).hexdigest()[:16]
+        cache_path = self.cache_dir / f"{path_key}_{version_key}.npy"
+        
+        if cache_path.exists():
+            try:
+                data = np.load(cache_path)
+                os.utime(cache_path)  # 更新修改时间，作为最近使用时间
+                self.logger.debug(f"使用Excel解析缓存: {cache_path}")
+                return data
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"读取Excel解析缓存失败，重新解析文件: {str(e)}")
+        
+        # pandas仅在解析Excel时使用，延迟导入以缩短程序启动时间
+        import pandas as pd
+        df = pd.read_excel(file_path, usecols=self.EXCEL_COLUMNS, engine=EXCEL_READ_ENGINE)
+        data = df.to_numpy(dtype=np.float64)
+        
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            np.save(cache_path, data)
+            self._prune_excel_cache(path_key, cache_path)
+        except OSError as e:
+            self.logger.warning(f"保存Excel解析缓存失败: {str(e)}")
+        
+        return data
+    
+    def _prune_excel_cache(self, path_key: str, cache_path: Path):
+        """清理Excel解析缓存
+        
+        删除同一文件旧版本的缓存，并按最近使用时间只保留EXCEL_CACHE_MAX_FILES个缓存文件。
+        
+        Args:
+            path_key (str): 当前文件路径的哈希
+            cache_path (Path): 当前文件的缓存路径，不会被删除
+        """
+        cache_files = []
+        for path in self.cache_dir.glob("*.npy"):
+            if path == cache_path:
+                continue
+            if path.name.startswith(f"{path_key}_"):
+                path.unlink(missing_ok=True)
+            else:
+                cache_files.append(path)
+        
+        # 当前文件的缓存占一个名额，其余按修改时间从新到旧保留
+        cache_files.sort(key=lambda path: path.stat().st_mtime_ns, reverse=True)
+        for path in cache_files[self.EXCEL_CACHE_MAX_FILES - 1:]:
+            path.unlink(missing_ok=True)
+        
     def start_slice(self):
         """开始数据切片处理
         
@@ -148,25 +214,35 @@ class DataProcessor:
             self.slice_length
         )
         
-        # 存储切片结果和时间范围
-        sliced_data = []
+        # 按时间有序排列后二分查找所有切片边界，数据通常已按TOA排序，此时无需排序
+        if np.all(time_data[1:] >= time_data[:-1]):
+            order = None
+            sorted_time = time_data
+        else:
+            order = np.argsort(time_data, kind='stable')
+            sorted_time = time_data[order]
+        boundary_indices = np.searchsorted(sorted_time, slice_boundaries, side='left')
+        
+        # 跳过空的时间窗口，按非空切片数量预分配切片结果和时间范围
+        nonempty = np.flatnonzero(np.diff(boundary_indices))
+        slice_starts = boundary_indices[nonempty]
+        slice_ends = boundary_indices[nonempty + 1]
+        sliced_data = [None] * len(nonempty)
+        time_ranges = [None] * len(nonempty)
         
-        # 进行切片
-        for i in range(len(slice_boundaries) - 1):
-            start_time = slice_boundaries[i]
-            end_time = slice_boundaries[i + 1]
-            
-            # 提取当前时间窗口内的数据
-            mask = (time_data >= start_time) & (time_data < end_time)
-            current_slice = self.data[mask]
-
-            if len(current_slice) == 0:
-                continue
+        # 进行切片，每个时间窗口[start_time, end_time)对应有序数据中的一段连续区间
+        for i, (start_idx, end_idx) in enumerate(zip(slice_starts, slice_ends)):
+            # 提取当前时间窗口内的数据，保持原始数据顺序
+            if order is None:
+                current_slice = self.data[start_idx:end_idx]
+            else:
+                current_slice = self.data[np.sort(order[start_idx:end_idx])]
                 
-            sliced_data.append(current_slice)
+            sliced_data[i] = current_slice
 
             start_toa = current_slice[0][self.slice_dim]
             end_toa = current_slice[-1][self.slice_dim]
-            self.time_ranges.append((start_toa, end_toa))
+            time_ranges[i] = (start_toa, end_toa)
         
+        self.time_ranges.extend(time_ranges)
         return sliced_data 
\ No newline at end of file
@@ -0,0 +1,60 @@
+import importlib.util
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, List, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# 结果一次性写入新文件，优先使用写入更快的xlsxwriter，未安装时回退到openpyxl
+# 仅检查是否安装，写入引擎在保存进程中才会导入
+EXCEL_WRITE_ENGINE = 'xlsxwriter' if importlib.util.find_spec('xlsxwriter') is not None else 'openpyxl'
+
+# 单个工作表的最大行数（含表头）
+EXCEL_MAX_ROWS = 1048576
+
+# 保存进程池，首次提交时创建并在后续处理中复用
+_save_pool = None
+
+
+def write_excel_sheets(file_path: str, sheets: List[Tuple[str, 'pd.DataFrame']]) -> str:
+    """将多个DataFrame写入同一个Excel文件
+
+    本函数在保存进程中执行，模块只依赖pandas，子进程无需加载Qt或TensorFlow。
+
+    Args:
+        file_path: 保存路径，已存在时覆盖
+        sheets: (工作表名, DataFrame) 列表，按顺序写入
+
+    Returns:
+        str: 保存路径
+    """
+    import pandas as pd
+
+    with pd.ExcelWriter(file_path, engine=EXCEL_WRITE_ENGINE) as writer:
+        for sheet_name, df in sheets:
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+    return file_path
+
+
+def submit_excel_write(file_path: str, sheets: List[Tuple[str, 'pd.DataFrame']]) -> Future:
+    """在保存进程池中异步写入Excel文件
+
+    Args:
+        file_path: 保存路径
+        sheets: (工作表名, DataFrame) 列表
+
+    Returns:
+        Future: 写入任务，结果为保存路径
+    """
+    global _save_pool
+    if _save_pool is None:
+        # 使用spawn方式启动，避免在已有Qt线程的进程中fork
+        _save_pool = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        return _save_pool.submit(write_excel_sheets, file_path, sheets)
+    except BrokenProcessPool:
+        # 保存进程异常退出后重建进程池
+        _save_pool = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('spawn'))
+        return _save_pool.submit(write_excel_sheets, file_path, sheets)
@@ -1,5 +1,9 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
 from datetime import datetime
 from pathlib import Path
 
@@ -18,8 +22,10 @@ class LogManager:
         - 日志级别设置为DEBUG
         - 日志格式：时间 - 级别 - 消息
         - 时间格式：YYYY-MM-DD HH:MM:SS
+        - 日志记录经队列交由后台线程写入文件，调用方不等待磁盘I/O
     """
     _instance = None
+    _lock = threading.Lock()  # 保证多线程首次创建时只初始化一次
     
     def __new__(cls):
         """实现单例模式
@@ -28,8 +34,11 @@ class LogManager:
             LogManager: 日志管理器的唯一实例
         """
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._initialized = False
+                    cls._instance = instance
         return cls._instance
     
     def __init__(self):
@@ -39,13 +48,19 @@ class LogManager:
         - 创建以当前时间命名的日志文件
         - 配置日志记录器
         - 设置日志格式和处理器
+        - 启动后台写日志线程，并在程序退出时停止
         
         Notes:
             如果实例已经初始化，则直接返回，避免重复初始化
         """
         if self._initialized:
             return
-            
+        with LogManager._lock:
+            if not self._initialized:
+                self._setup()
+    
+    def _setup(self):
+        """创建日志文件并配置处理器，调用方需持有类锁"""
         # 创建logs目录
         self.log_dir = Path("logs")
         self.log_dir.mkdir(exist_ok=True)
@@ -57,6 +72,11 @@ class LogManager:
         # 配置日志记录器
         self.logger = logging.getLogger('RadarSignal')
         self.logger.setLevel(logging.DEBUG)
+        self._listener = None
+        if self.logger.handlers:
+            # 记录器已配置过处理器，不再重复添加，避免每条日志写入多次
+            self._initialized = True
+            return
         
         # 创建文件处理器
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
@@ -69,67 +89,91 @@ class LogManager:
         )
         file_handler.setFormatter(formatter)
         
-        # 添加处理器
-        self.logger.addHandler(file_handler)
+        # 调用线程只将日志记录放入队列，由后台线程写入文件
+        self._queue = queue.Queue(-1)
+        self.logger.addHandler(logging.handlers.QueueHandler(self._queue))
+        self._listener = logging.handlers.QueueListener(self._queue, file_handler)
+        self._listener.start()
+        atexit.register(self.shutdown)
         
         self._initialized = True
     
-    def debug(self, message: str):
+    def shutdown(self):
+        """停止后台写日志线程
+        
+        Notes:
+            停止前会写完队列中剩余的日志记录，重复调用无副作用
+        """
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+    
+    def debug(self, message: str, *args, **kwargs):
         """记录调试信息
         
         Args:
-            message (str): 调试信息内容
+            message (str): 调试信息内容，可包含%格式占位符
+            *args: 格式化参数，仅在日志实际输出时才格式化
+            **kwargs: 透传给logging的关键字参数（如exc_info）
             
         Notes:
             日志级别：DEBUG
             用于记录详细的调试信息，帮助开发人员追踪程序运行状态
         """
-        self.logger.debug(message)
+        self.logger.debug(message, *args, **kwargs)
     
-    def info(self, message: str):
+    def info(self, message: str, *args, **kwargs):
         """记录一般信息
         
         Args:
-            message (str): 一般信息内容
+            message (str): 一般信息内容，可包含%格式占位符
+            *args: 格式化参数，仅在日志实际输出时才格式化
+            **kwargs: 透传给logging的关键字参数（如exc_info）
             
         Notes:
             日志级别：INFO
             用于记录程序的正常运行信息，如操作完成、状态更新等
         """
-        self.logger.info(message)
+        self.logger.info(message, *args, **kwargs)
     
-    def warning(self, message: str):
+    def warning(self, message: str, *args, **kwargs):
         """记录警告信息
         
         Args:
-            message (str): 警告信息内容
+            message (str): 警告信息内容，可包含%格式占位符
+            *args: 格式化参数，仅在日志实际输出时才格式化
+            **kwargs: 透传给logging的关键字参数（如exc_info）
             
         Notes:
             日志级别：WARNING
             用于记录可能的问题或异常情况，但不影响程序的主要功能
         """
-        self.logger.warning(message)
+        self.logger.warning(message, *args, **kwargs)
     
-    def error(self, message: str):
+    def error(self, message: str, *args, **kwargs):
         """记录错误信息
         
         Args:
-            message (str): 错误信息内容
+            message (str): 错误信息内容，可包含%格式占位符
+            *args: 格式化参数，仅在日志实际输出时才格式化
+            **kwargs: 透传给logging的关键字参数（如exc_info）
             
         Notes:
             日志级别：ERROR
             用于记录导致功能无法正常运行的错误
         """
-        self.logger.error(message)
+        self.logger.error(message, *args, **kwargs)
     
-    def critical(self, message: str):
+    def critical(self, message: str, *args, **kwargs):
         """记录严重错误信息
         
         Args:
-            message (str): 严重错误信息内容
+            message (str): 严重错误信息内容，可包含%格式占位符
+            *args: 格式化参数，仅在日志实际输出时才格式化
+            **kwargs: 透传给logging的关键字参数（如exc_info）
             
         Notes:
             日志级别：CRITICAL
             用于记录需要立即处理的严重问题，可能导致程序崩溃或数据丢失
         """
-        self.logger.critical(message) 
\ No newline at end of file
+        self.logger.critical(message, *args, **kwargs) 
\ No newline at end of file
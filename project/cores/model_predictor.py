@@ -2,10 +2,188 @@ import tensorflow as tf
 import numpy as np
 from PIL import Image
 import os
-from typing import Tuple, Optional, Dict
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Tuple, Optional, Dict, List
 from .plot_manager import SignalPlotter
 from .log_manager import LogManager
 
+
+def _get_tflite_interpreter_class():
+    """获取TFLite解释器类，优先使用tflite_runtime
+    
+    体积优化打包时会排除tensorflow.lite，因此在实际需要时才访问，
+    两者均不可用时返回None。
+    """
+    try:
+        from tflite_runtime.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    try:
+        return tf.lite.Interpreter
+    except (ImportError, AttributeError):
+        return None
+
+
+class TFLiteModel:
+    """TFLite模型包装器
+    
+    提供与KerasModel.predict一致的调用方式，由convert_model.py
+    离线转换得到的.tflite文件通过该类加载，推理时不经过Keras图执行。
+    """
+
+    def __init__(self, model_path: str):
+        self.interpreter = _get_tflite_interpreter_class()(model_path=model_path)
+        self.interpreter.allocate_tensors()
+        self.input_index = self.interpreter.get_input_details()[0]['index']
+        self.output_index = self.interpreter.get_output_details()[0]['index']
+
+    def predict(self, x: np.ndarray, verbose: int = 0) -> np.ndarray:
+        """执行单批次推理，返回输出张量的副本"""
+        input_shape = self.interpreter.get_input_details()[0]['shape']
+        if input_shape[0] != x.shape[0]:
+            # 批大小变化时调整输入张量形状
+            self.interpreter.resize_tensor_input(self.input_index, x.shape)
+            self.interpreter.allocate_tensors()
+        self.interpreter.set_tensor(self.input_index, x.astype(np.float32, copy=False))
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self.output_index)
+
+
+class KerasModel:
+    """Keras模型包装器
+    
+    通过XLA编译（jit_compile）的tf.function执行推理，卷积、偏置与激活等算子
+    融合为单个内核，减少中间张量的读写。XLA按输入形状编译，批大小向上取整到
+    2的幂（补零行不参与结果），限制编译次数；编译或执行失败时回退到直接调用模型。
+    推理批次较小（见PIPELINE_CHUNK_SIZE），直接调用模型可省去model.predict
+    构建数据集和回调的开销。
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._infer = tf.function(lambda x: model(x, training=False), jit_compile=True)
+        self._use_jit = True
+
+    def predict(self, x: np.ndarray, verbose: int = 0) -> np.ndarray:
+        """执行单批次推理，返回输出数组"""
+        if self._use_jit:
+            try:
+                batch_size = x.shape[0]
+                padded_size = 1 << max(batch_size - 1, 0).bit_length()
+                if padded_size != batch_size:
+                    padded = np.zeros((padded_size,) + x.shape[1:], dtype=np.float32)
+                    padded[:batch_size] = x
+                else:
+                    padded = x
+                return self._infer(tf.constant(padded, dtype=tf.float32)).numpy()[:batch_size]
+            except Exception as e:
+                # 当前环境不支持XLA编译时不再尝试
+                self._use_jit = False
+                LogManager().warning(f"XLA编译推理失败，改用直接调用模型: {str(e)}")
+        return self.model(tf.constant(x, dtype=tf.float32), training=False).numpy()
+
+
+# 多个预测器副本共享同一模型对象，推理调用需串行执行
+_inference_lock = threading.Lock()
+
+# 推理流水线：批量预测时每生成PIPELINE_CHUNK_SIZE个聚类的图像即提交推理线程，
+# 推理期间（TensorFlow释放GIL）继续生成后续聚类的图像
+PIPELINE_CHUNK_SIZE = 16
+_inference_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='inference')
+
+
+@lru_cache(maxsize=16)
+def _rounded_threshold_boundary(threshold: float, dtype: str):
+    """计算保留4位小数后不小于阈值的最小置信度
+
+    confs < 边界值与np.round(confs, 4) < threshold结果一致，每个阈值只计算一次。
+    边界在不小于阈值的最小4位小数减去5e-5处，取其前后几个相邻浮点数中np.round后
+    不小于阈值的最小者，因此恰为x.5的舍入同np.round一样按五成双处理。
+
+    Args:
+        threshold: 置信度阈值
+        dtype: 置信度数组的数据类型
+
+    Returns:
+        置信度数据类型的边界值
+    """
+    dtype = np.dtype(dtype)
+    center = dtype.type((np.ceil(threshold * 1e4 - 1e-6) - 0.5) / 1e4)
+    candidates = center + np.arange(-8, 9, dtype=dtype) * np.abs(np.spacing(center))
+    return candidates[np.argmax(np.round(candidates, 4) >= threshold)]
+
+
+class ImageCache:
+    """预测图像的LRU缓存
+
+    以聚类数据内容为键缓存生成的PA、DTOA灰度图像，重复预测相同聚类时
+    无需重新绘图。预测器副本之间共享同一缓存，读写通过锁保护。
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[Dict[str, np.ndarray]]:
+        with self._lock:
+            images = self._images.get(key)
+            if images is not None:
+                self._images.move_to_end(key)
+            return images
+
+    def put(self, key, images: Dict[str, np.ndarray]):
+        for image in images.values():
+            image.setflags(write=False)  # 缓存的图像被多次使用，禁止修改
+        with self._lock:
+            self._images[key] = images
+            self._images.move_to_end(key)
+            while len(self._images) > self.max_size:
+                self._images.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+
+
+@lru_cache(maxsize=4)
+def _load_model_cached(model_path: str, mtime_ns: int, size: int):
+    """加载模型（带缓存）
+    
+    .tflite文件包装为TFLiteModel，其余按Keras模型加载并包装为KerasModel。
+    以文件路径、修改时间和大小作为缓存键，同一模型文件只加载一次；
+    文件被覆盖后缓存键随之变化，会重新加载。
+    """
+    if model_path.endswith('.tflite'):
+        return TFLiteModel(model_path)
+    return KerasModel(tf.keras.models.load_model(model_path))
+
+
+def load_keras_model(model_path: str):
+    """加载模型，多个预测器实例共享同一个已加载的模型
+    
+    若模型文件旁存在同名且不早于它的.tflite文件（见convert_model.py），
+    且TFLite解释器可用，则优先加载TFLite模型。
+    
+    Args:
+        model_path: 模型文件路径
+        
+    Returns:
+        KerasModel或TFLiteModel: 已加载的模型，均提供predict方法
+    """
+    stat = os.stat(model_path)
+    tflite_path = os.path.splitext(model_path)[0] + '.tflite'
+    if os.path.exists(tflite_path) and _get_tflite_interpreter_class() is not None:
+        tflite_stat = os.stat(tflite_path)
+        if tflite_stat.st_mtime_ns >= stat.st_mtime_ns:
+            model_path, stat = tflite_path, tflite_stat
+    return _load_model_cached(os.path.abspath(model_path), stat.st_mtime_ns, stat.st_size)
+
 class ModelPredictor:
     """模型预测器
     
@@ -16,6 +194,7 @@ class ModelPredictor:
         model_pa (tf.keras.Model): PA预测模型
         temp_dir (str): 临时文件目录
         plotter (SignalPlotter): 信号绘图器实例
+        image_cache (ImageCache): 预测图像缓存，副本之间共享
         logger (LogManager): 日志管理器实例
         th_dtoa (float): DTOA预测阈值，默认0.91
         th_pa (float): PA预测阈值，默认0.9
@@ -31,6 +210,7 @@ class ModelPredictor:
         self.temp_dir = "temp"
         self.plotter = SignalPlotter()
         self.logger = LogManager()
+        self.image_cache = ImageCache()
         
         # 添加模型路径属性
         self.dtoa_model_path = None
@@ -42,6 +222,28 @@ class ModelPredictor:
 
         self.time_ranges = []  # 初始化时间范围列表
 
+    def clone(self) -> 'ModelPredictor':
+        """创建共享已加载模型的预测器副本
+        
+        副本拥有独立的绘图器和时间范围等状态，可在并行任务中使用；
+        模型对象和预测图像缓存不复制，推理调用通过模块级锁串行执行。
+        
+        Returns:
+            ModelPredictor: 预测器副本
+        """
+        predictor = ModelPredictor()
+        predictor.dtoa_model = self.dtoa_model
+        predictor.pa_model = self.pa_model
+        predictor.dtoa_model_path = self.dtoa_model_path
+        predictor.pa_model_path = self.pa_model_path
+        predictor.th_dtoa = self.th_dtoa
+        predictor.th_pa = self.th_pa
+        predictor.time_ranges = list(self.time_ranges)
+        predictor.image_cache = self.image_cache
+        if self.temp_dir:
+            predictor.set_temp_dir(self.temp_dir)
+        return predictor
+
     def set_time_ranges(self, time_ranges: list):
         """设置时间范围列表
         
@@ -67,11 +269,11 @@ class ModelPredictor:
             
             self.logger.info("\n=== 开始加载模型 ===")
             
-            self.dtoa_model = tf.keras.models.load_model(dtoa_model_path)
+            self.dtoa_model = load_keras_model(dtoa_model_path)
             self.logger.info("DTOA模型加载成功")
             self.logger.info(f"DTOA模型加载路径: {dtoa_model_path}")
             
-            self.pa_model = tf.keras.models.load_model(pa_model_path)
+            self.pa_model = load_keras_model(pa_model_path)
             self.logger.info("PA模型加载成功")
             self.logger.info(f"PA模型加载路径: {pa_model_path}")
             
@@ -79,6 +281,9 @@ class ModelPredictor:
             self.dtoa_model_path = dtoa_model_path
             self.pa_model_path = pa_model_path
             
+            # 重新加载模型时释放缓存的预测图像
+            self.clear_cache()
+            
             return True
             
         except Exception as e:
@@ -122,103 +327,199 @@ class ModelPredictor:
             - PA预测使用400x80的图像输入
             - DTOA预测使用500x250的图像输入
             - 预测结果会根据置信度阈值进行后处理
-            - 临时生成的图像文件会在预测后删除
+            - 预测图像在内存中生成，不写入临时文件
         """
-        try:
-            if not self.pa_model:
-                self.logger.error("PA模型未正确初始化")
-            if not self.dtoa_model:
-                self.logger.error("DTOA模型未正确初始化")
-            if not self.temp_dir:
-                self.logger.error("临时目录未正确初始化")
-            if not self.pa_model or not self.dtoa_model or not self.temp_dir:
-                self.logger.error("模型或临时目录未正确初始化")
-                return False, 0.0, 0.0, -1, -1, {}, {}
+        return self.predict_batch([cluster_data])[0]
+
+    def predict_batch(self, cluster_data_list: List[dict]) -> List[Tuple[bool, float, float, int, int, dict, dict]]:
+        """批量预测多个聚类结果的PA和DTOA特征
+        
+        逐个聚类在内存中生成预测图像（不经过PNG文件读写），每PIPELINE_CHUNK_SIZE个
+        聚类为一块，PA、DTOA模型各调用一次predict完成一块的推理；前面各块在推理线程中
+        执行，与后续聚类的绘图重叠。
+        
+        Args:
+            cluster_data_list (List[dict]): 聚类数据字典列表，字段同predict
             
+        Returns:
+            List[Tuple]: 与输入顺序一致的预测结果列表，每项格式同predict的返回值，
+                单个聚类绘图失败时对应项为失败结果
+        """
+        failed_result = (False, 0.0, 0.0, -1, -1, {}, {})
+        results = [failed_result] * len(cluster_data_list)
+        if not cluster_data_list:
+            return results
 
-            self.logger.info(f"预测 切片{cluster_data.get('slice_idx', '?')+1} - {cluster_data.get('dim_name', '?')}维度 - 聚类{cluster_data.get('cluster_idx', '?')}")
+        if not self.pa_model:
+            self.logger.error("PA模型未正确初始化")
+        if not self.dtoa_model:
+            self.logger.error("DTOA模型未正确初始化")
+        if not self.pa_model or not self.dtoa_model:
+            self.logger.error("模型未正确初始化")
+            return results
 
-            # 使用plot_manager生成图像并获取路径
-            image_paths = self.plotter.plot_cluster(cluster_data, for_predict=True)
-            # self.logger.debug(f"预测图像绘制完成: {list(image_paths.keys())}")
+        # 在内存中生成每个聚类的预测图像，先保留uint8灰度图，按块转换为模型输入；
+        # 除最后一块外均提交推理线程，与后续聚类的绘图重叠执行
+        dtoa_images = []
+        pa_images = []
+        batch_indices = []
+        pending = []  # (聚类索引列表, 推理任务)
+        for i, cluster_data in enumerate(cluster_data_list):
+            try:
+                self.logger.info(f"预测 切片{cluster_data.get('slice_idx', '?')+1} - {cluster_data.get('dim_name', '?')}维度 - 聚类{cluster_data.get('cluster_idx', '?')}")
+
+                # 使用plot_manager在内存中生成图像，相同聚类直接取缓存
+                cache_key = self._image_cache_key(cluster_data)
+                images = self.image_cache.get(cache_key)
+                if images is None:
+                    images = self.plotter.render_cluster(cluster_data)
+                    if not images:
+                        raise ValueError("生成预测图像失败")
+                    self.image_cache.put(cache_key, images)
+
+                dtoa_images.append(images['DTOA'])
+                pa_images.append(images['PA'])
+                batch_indices.append(i)
+
+            except Exception as e:
+                self.logger.error(f"预测出错: {str(e)}")
+                import traceback
+                self.logger.error(f"错误详情:\n{traceback.format_exc()}")
+
+            if len(batch_indices) == PIPELINE_CHUNK_SIZE and i < len(cluster_data_list) - 1:
+                pending.append((batch_indices, _inference_executor.submit(self._infer_batch, dtoa_images, pa_images)))
+                dtoa_images, pa_images, batch_indices = [], [], []
+
+        if batch_indices:
+            pending.append((batch_indices, None))
+
+        for chunk_indices, future in pending:
+            try:
+                if future is not None:
+                    dtoa_preds, pa_preds = future.result()
+                else:
+                    dtoa_preds, pa_preds = self._infer_batch(dtoa_images, pa_images)
+
+                for i, result in zip(chunk_indices, self._postprocess_predictions(dtoa_preds, pa_preds)):
+                    results[i] = result
+
+            except Exception as e:
+                self.logger.error(f"预测出错: {str(e)}")
+                import traceback
+                self.logger.error(f"错误详情:\n{traceback.format_exc()}")
+
+        return results
+
+    def _infer_batch(self, dtoa_images: List[np.ndarray], pa_images: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """对一批聚类图像进行DTOA和PA模型推理
+
+        Args:
+            dtoa_images (List[np.ndarray]): DTOA灰度图像列表
+            pa_images (List[np.ndarray]): PA灰度图像列表
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: DTOA和PA模型输出
+        """
+        dtoa_batch = self._build_input_batch(dtoa_images)
+        pa_batch = self._build_input_batch(pa_images)
+        with _inference_lock:
+            dtoa_preds = self.dtoa_model.predict(dtoa_batch, verbose=0)
+            pa_preds = self.pa_model.predict(pa_batch, verbose=0)
+        return dtoa_preds, pa_preds
+
+    def _image_cache_key(self, cluster_data: dict) -> tuple:
+        """计算聚类预测图像的缓存键
+
+        预测图像只取决于PA、TOA两列数据、切片时间范围和绘图配置，
+        其中DTOA图像的y_max在绘图时按数据确定，不计入缓存键。
+
+        Args:
+            cluster_data (dict): 聚类数据字典，字段同predict
+
+        Returns:
+            tuple: 缓存键
+        """
+        points = np.ascontiguousarray(cluster_data['points'][:, 3:5])
+        digest = hashlib.blake2b(points.tobytes(), digest_size=16).digest()
+        pa_config = self.plotter.configs['PA']
+        dtoa_config = self.plotter.configs['DTOA']
+        return (
+            digest,
+            points.shape,
+            tuple(cluster_data.get('time_ranges', (0, 0))),
+            (pa_config.y_min, pa_config.y_max, pa_config.img_height, pa_config.img_width),
+            (dtoa_config.y_min, dtoa_config.img_height, dtoa_config.img_width),
+        )
+
+    def clear_cache(self):
+        """清空预测图像缓存"""
+        self.image_cache.clear()
+
+    def _postprocess_predictions(self, dtoa_preds: np.ndarray, pa_preds: np.ndarray) -> List[Tuple[bool, float, float, int, int, dict, dict]]:
+        """对整批聚类的模型输出进行后处理
+
+        类别合并、阈值判断和PA特殊处理均按批次向量化计算，结果与逐个聚类处理一致。
+
+        Args:
+            dtoa_preds (np.ndarray): DTOA模型输出，形状为(N, n_classes)
+            pa_preds (np.ndarray): PA模型输出，形状为(N, n_classes)
+
+        Returns:
+            List[Tuple]: 每个聚类的预测结果，格式同predict的返回值
+        """
+        # DTOA长短类别整合
+        dtoa_merged = np.stack([
+            dtoa_preds[:, 0] + dtoa_preds[:, 1],
+            dtoa_preds[:, 2],
+            dtoa_preds[:, 3] + dtoa_preds[:, 4],
+            dtoa_preds[:, 5],
+            dtoa_preds[:, 6:].sum(axis=1),
+        ], axis=1)
+        dtoa_labels = dtoa_merged.argmax(axis=1)
+        dtoa_confs = dtoa_merged.max(axis=1)
+
+        # DTOA后处理
+        # if dtoa_conf < self.th_dtoa:
+        #     dtoa_label = 6
+        dtoa_labels[dtoa_confs < _rounded_threshold_boundary(self.th_dtoa, dtoa_confs.dtype.str)] = 4
+        np.minimum(dtoa_labels, 4, out=dtoa_labels)
+
+        # PA标签和置信度取自原始输出，其后无效类别合并到第5类
+        pa_labels = pa_preds.argmax(axis=1)
+        pa_confs = pa_preds.max(axis=1)
+        pa_merged = np.concatenate([pa_preds[:, :5], pa_preds[:, 5:].sum(axis=1, keepdims=True)], axis=1)
+
+        # PA后处理
+        pa_labels[pa_confs < _rounded_threshold_boundary(self.th_pa, pa_confs.dtype.str)] = 9
+        np.minimum(pa_labels, 5, out=pa_labels)
+
+        # PA特殊处理：前三类概率之和足够大时取其中最大者，置信度为三者之和
+        top3_probs = pa_preds[:, :3]
+        top3_sums = top3_probs.sum(axis=1)
+        special = (pa_labels >= 5) & (top3_sums > 0.99)
+        pa_labels[special] = top3_probs[special].argmax(axis=1)
+        pa_confs[special] = top3_sums[special]
+
+        # 调试新增功能，后续删掉
+        # 保存预测结果中置信度大于0（保留4位小数）的标签及其对应的置信度
+        # 保留4位小数后大于0，即乘以1e4后取整不小于1，等价于乘积大于0.5（0.5舍入到0）
+        dtoa_nonzero = dtoa_merged * dtoa_merged.dtype.type(1e4) > 0.5
+        pa_nonzero = pa_merged * pa_merged.dtype.type(1e4) > 0.5
+
+        results = []
+        for row in range(len(dtoa_merged)):
+            dtoa_idx = np.flatnonzero(dtoa_nonzero[row])
+            pa_idx = np.flatnonzero(pa_nonzero[row])
+            dtoa_conf_dict = dict(zip(dtoa_idx.tolist(), dtoa_merged[row, dtoa_idx].tolist()))
+            pa_conf_dict = dict(zip(pa_idx.tolist(), pa_merged[row, pa_idx].tolist()))
+            pa_label, pa_conf = pa_labels[row], pa_confs[row]
+            dtoa_label, dtoa_conf = dtoa_labels[row], dtoa_confs[row]
 
-            # DTOA预测
-            dtoa_image = self._preprocess_image(image_paths['DTOA'])
-            
-            dtoa_pred = self.dtoa_model.predict(dtoa_image, verbose=0)
-            
-            # 长短类别整合
-            dtoa_pred[0, 0] = dtoa_pred[0, 0] + dtoa_pred[0, 1]
-            dtoa_pred[0, 1] = dtoa_pred[0, 2]
-            dtoa_pred[0, 2] = dtoa_pred[0, 3] + dtoa_pred[0, 4]
-            dtoa_pred[0, 3] = dtoa_pred[0, 5]
-            dtoa_pred[0, 4] = np.sum(dtoa_pred[0, 6:])
-            dtoa_pred[0, 5:] = 0
-            
-            dtoa_label = np.argmax(dtoa_pred, axis=1)[0]
-            dtoa_conf = np.max(dtoa_pred, axis=1)[0]
-
-
-            # DTOA后处理
-            # if dtoa_conf < self.th_dtoa:
-            #     dtoa_label = 6
-            # if dtoa_label >= 4:
-            #     dtoa_label = 4
-            # dtoa_pred[0, 6] = np.sum(dtoa_pred[0, 6:])
-            if np.round(dtoa_conf, 4) < self.th_dtoa:
-                dtoa_label = 4
-            if dtoa_label >= 4:
-                dtoa_label = 4
-
-            # 调试新增功能，后续删掉
-            # 保存DTOA预测结果中置信度大于0的标签及其对应的置信度
-            dtoa_conf_dict = {}
-            for i, conf in enumerate(dtoa_pred[0, :5]):
-                if np.round(conf, 4) > 0:
-                    dtoa_conf_dict[i] = conf
-
-            # PA预测
-            pa_image = self._preprocess_image(image_paths['PA'])
-            
-            pa_pred = self.pa_model.predict(pa_image, verbose=0)
-            pa_label = np.argmax(pa_pred, axis=1)[0]
-            pa_conf = np.max(pa_pred, axis=1)[0]
-
-            # PA后处理
-            pa_pred[0, 5] = np.sum(pa_pred[0, 5:])
-            if np.round(pa_conf, 4) < self.th_pa:
-                pa_label = 9
-            if pa_label >= 5:
-                pa_label = 5
-
-            # PA特殊处理
-            if pa_label >= 5 and np.sum(pa_pred[0, :3]) > 0.99:
-                top3_probs = pa_pred[0, :3]
-                pa_label = np.argmax(top3_probs)
-                pa_conf = np.sum(top3_probs)  # PA维度概率特殊处理
-            
-            # 保存PA预测结果中置信度大于0的标签及其对应的置信度
-            pa_conf_dict = {}
-            for i, conf in enumerate(pa_pred[0, :6]):
-                if np.round(conf, 4) > 0:
-                    pa_conf_dict[i] = conf
-
-            # 清理临时文件
-            for path in image_paths.values():
-                if os.path.exists(path):
-                    os.remove(path)
-
-            # self.logger.info(f"最终预测结果:")
             self.logger.info(f"PA - 标签: {pa_label}, 置信度: {pa_conf:.4f}")
             self.logger.info(f"DTOA - 标签: {dtoa_label}, 置信度: {dtoa_conf:.4f}")
 
-            return True, float(pa_conf), float(dtoa_conf), int(pa_label), int(dtoa_label), dict(pa_conf_dict), dict(dtoa_conf_dict)
-
-        except Exception as e:
-            self.logger.error(f"预测出错: {str(e)}")
-            import traceback
-            self.logger.error(f"错误详情:\n{traceback.format_exc()}")
-            return False, 0.0, 0.0, -1, -1, {}, {}
+            results.append((True, float(pa_conf), float(dtoa_conf), int(pa_label), int(dtoa_label), pa_conf_dict, dtoa_conf_dict))
+        return results
 
     # def _preprocess_image(self, image_path: str, target_size: Tuple[int, int]) -> np.ndarray:
     #     """预处理图像用于模型输入
@@ -263,6 +564,41 @@ class ModelPredictor:
         img_array = img_array / 255.0  # 归一化
         return np.expand_dims(img_array, axis=0)  # 添加batch维度
 
+    def _build_input_batch(self, images: List[np.ndarray]) -> np.ndarray:
+        """将多张灰度图像直接写入预分配的模型输入批次
+
+        每张图像的结果与_preprocess_array一致，不产生逐张的中间数组和拼接复制。
+
+        Args:
+            images (List[np.ndarray]): 尺寸相同的uint8灰度图像列表
+
+        Returns:
+            np.ndarray: 模型输入，形状为(N, height, width, 3)
+        """
+        batch = np.empty((len(images),) + images[0].shape + (3,), dtype=np.float32)
+        gray = batch[..., 0]
+        for row, image in enumerate(images):
+            np.divide(image, np.float32(255.0), out=gray[row])  # 归一化
+        # 灰度复制为RGB三通道
+        batch[..., 1] = gray
+        batch[..., 2] = gray
+        return batch
+
+    def _preprocess_array(self, image: np.ndarray) -> np.ndarray:
+        """预处理内存中的灰度图像用于模型输入
+
+        结果与将同一图像保存为PNG后经_preprocess_image读取一致。
+
+        Args:
+            image (np.ndarray): uint8灰度图像，形状为(height, width)
+
+        Returns:
+            np.ndarray: 预处理后的图像数组，形状为(1, height, width, 3)
+        """
+        img_array = image.astype(np.float32) / 255.0  # 归一化
+        # 灰度复制为RGB三通道并添加batch维度
+        return np.repeat(img_array[np.newaxis, :, :, np.newaxis], 3, axis=3)
+
     def load_pa_model(self, model_path: str) -> bool:
         """单独加载PA模型
         
@@ -273,9 +609,6 @@ class ModelPredictor:
             bool: 加载是否成功
         """
         try:
-            import tensorflow as tf
-            import os
-            
             self.logger.info(f"开始加载PA模型: {model_path}")
             
             # 检查文件是否存在
@@ -283,13 +616,10 @@ class ModelPredictor:
                 self.logger.error(f"PA模型文件不存在: {model_path}")
                 return False
                 
-            # 释放之前的模型内存（如果有）
-            if hasattr(self, 'pa_model') and self.pa_model is not None:
-                del self.pa_model
-                tf.keras.backend.clear_session()
-                
+            # 不调用clear_session：它会清除全局图状态，另一个模型的已编译推理函数也需重新追踪；
+            # 模型由load_keras_model缓存，直接替换引用即可
             # 加载模型
-            self.pa_model = tf.keras.models.load_model(model_path)
+            self.pa_model = load_keras_model(model_path)
             self.pa_model_path = model_path
             
             self.logger.info(f"PA模型加载成功")
@@ -309,9 +639,6 @@ class ModelPredictor:
             bool: 加载是否成功
         """
         try:
-            import tensorflow as tf
-            import os
-            
             self.logger.info(f"开始加载DTOA模型: {model_path}")
             
             # 检查文件是否存在
@@ -319,13 +646,10 @@ class ModelPredictor:
                 self.logger.error(f"DTOA模型文件不存在: {model_path}")
                 return False
                 
-            # 释放之前的模型内存（如果有）
-            if hasattr(self, 'dtoa_model') and self.dtoa_model is not None:
-                del self.dtoa_model
-                tf.keras.backend.clear_session()
-                
+            # 不调用clear_session：它会清除全局图状态，另一个模型的已编译推理函数也需重新追踪；
+            # 模型由load_keras_model缓存，直接替换引用即可
             # 加载模型
-            self.dtoa_model = tf.keras.models.load_model(model_path)
+            self.dtoa_model = load_keras_model(model_path)
             self.dtoa_model_path = model_path
             
             self.logger.info(f"DTOA模型加载成功")
@@ -1,5 +1,7 @@
+import bisect
+
 import numpy as np
-from sklearn.cluster import DBSCAN
+from .roughly_clustering import dbscan_1d
 
 class ParamsExtractor:
     def __init__(self):
@@ -20,39 +22,64 @@ class ParamsExtractor:
         Raises:
             ValueError: 当输入数据为空或参数无效时抛出
         """
-        # 将数据转换为二维数组
-        data_reshaped = np.array(data).reshape(-1, 1)
+        # 将数据转换为一维数组
+        data_arr = np.asarray(data, dtype=float).ravel()
         
-        # 使用DBSCAN进行聚类
-        db = DBSCAN(eps=eps, min_samples=min_samples).fit(data_reshaped)
-    
-        # 获取聚类标签
-        labels = db.labels_
+        # 一维数据直接排序后进行DBSCAN聚类，获取聚类标签
+        labels = dbscan_1d(data_arr, eps, min_samples)
+        
+        # 按标签一次性统计各簇大小（排除噪声点）
+        cluster_sizes = np.bincount(labels[labels != -1])
         
-        # 提取成组变化的值（排除噪声点）
-        grouped_values = []
         # 计算每个组变值成立的阈值
-        clusters_with_multiple_samples = sum(1 for label in set(labels) if label != -1 and np.sum(labels == label) >= 2)
-        expected_min_size = len(data) / max(clusters_with_multiple_samples, 1) * threshold_ratio
+        clusters_with_multiple_samples = np.count_nonzero(cluster_sizes >= 2)
+        expected_min_size = len(data_arr) / max(clusters_with_multiple_samples, 1) * threshold_ratio
         # expected_min_size = 2
         
-        
-        for label in set(labels):
-            # 计算当前簇的大小
-            current_cluster_size = np.sum(labels == label)
-            if label != -1 and current_cluster_size > expected_min_size:
-                # 获取当前簇的所有值
-                cluster_values = [data[i] for i in range(len(data)) if labels[i] == label]
-                # 使用均值来代表该簇
-                cluster_mean = np.round(np.mean(cluster_values), 4)
-                grouped_values.append(cluster_mean)
+        # 提取成组变化的值，使用均值来代表各簇
+        # 均值按簇内数值的原顺序用np.mean计算，保证舍入到4位小数的结果与逐簇计算一致
+        grouped_values = [np.round(np.mean(data_arr[labels == label]), 4)
+                          for label in np.flatnonzero(cluster_sizes > expected_min_size)]
         
         return grouped_values
     
+    def is_dtoa_concentrated(self, toa: np.ndarray, center_range_ratio: float = 0.35,
+                             range_threshold: float = 1000, center_threshold: float = 0.7) -> bool:
+        """判断脉间参差类别的DTOA是否足够集中
+
+        满足以下任一条件即视为集中：
+        1. DTOA范围不超过range_threshold（us）
+        2. 落在中位数±center_range_ratio倍中位数内的DTOA比例不低于center_threshold
+
+        Args:
+            toa (np.ndarray): 到达时间序列（ms）
+            center_range_ratio (float): 中心范围相对中位数的比例，默认0.35
+            range_threshold (float): DTOA范围阈值（us），默认1000
+            center_threshold (float): 中心范围内数据比例阈值，默认0.7
+
+        Returns:
+            bool: DTOA是否集中
+        """
+        dtoa = np.diff(toa) * 1000  # 转换为us
+        if dtoa.size == 0:
+            return True
+
+        # 范围条件成立时无需再计算中位数
+        if np.ptp(dtoa) <= range_threshold:
+            return True
+
+        dtoa_median = np.median(dtoa)
+        in_center_count = np.count_nonzero(np.abs(dtoa - dtoa_median) <= center_range_ratio * dtoa_median)
+        return in_center_count / dtoa.size >= center_threshold
+
     def filter_related_numbers(self, numbers: list, tolerance: float = 0.4) -> list:
         """
         过滤掉数组中可能是其他数整数倍或其他数之和的数（抑制谐波）
         
+        按升序依次处理，已被过滤的数不再参与后续判断。利用数组有序：
+        整数倍关系对后续所有数一次性向量化判断；与某个和接近的数位于有序数组的
+        连续区间内，用二分查找定位；和不小于剩余最大值时不可能再过滤任何数，提前结束。
+        
         Args:
             numbers (list): 输入的一维数组
             tolerance (float): 判断误差容限，默认为0.4
@@ -72,82 +99,92 @@ class ParamsExtractor:
         max_ratio = int(arr[-1] / arr[0] + 1) if arr[0] != 0 else 1
         possible_multiples = np.arange(1, max_ratio + 1)
         
-        # 使用向量化操作检查整数倍关系
-        for i in range(n - 1):
-            if not mask[i]:
-                continue
-            
-            # 计算所有可能的倍数值
-            multiples = arr[i] * possible_multiples
-            
-            # 检查其他数是否接近这些倍数值
-            for j in range(i + 1, n):
-                if not mask[j]:
-                    continue
-                
-                # 添加异常处理，确保multiples不为空
-                if len(multiples) == 0:
+        # 检查整数倍关系：arr[i]只会过滤其后的数，对其后所有数一次性判断
+        if len(possible_multiples) > 0:
+            for i in range(n - 1):
+                if not mask[i]:
                     continue
-                
-                # 找到最接近的倍数
-                closest_multiple = multiples[np.argmin(np.abs(multiples - arr[j]))]
-                if abs(arr[j] - closest_multiple) < tolerance:
-                    mask[j] = False
+                rest = arr[i + 1:]
+                if arr[i] > 0:
+                    # 距离随倍数先减后增，最接近的倍数必在商的四舍五入值附近
+                    ratio = np.clip(np.round(rest / arr[i]), 1, max_ratio).astype(np.int64)
+                    candidates = np.clip(ratio[:, None] + np.array([-1, 0, 1]), 1, max_ratio)
+                    distances = np.abs(rest[:, None] - arr[i] * candidates).min(axis=1)
+                else:
+                    distances = np.abs(rest[:, None] - arr[i] * possible_multiples[None, :]).min(axis=1)
+                mask[i + 1:] &= distances >= tolerance
         
-        # 使用集合存储已检查过的和
-        checked_sums = set()
+        # 逐个判断和的关系时使用Python列表，避免numpy标量索引的开销
+        values = arr.tolist()
+        alive = mask.tolist()
+        alive_max = self._alive_max(values, alive)
         
-        # 检查两数之和
+        # 检查两数之和，和随j递增
         for i in range(n - 1):
-            if not mask[i]:
+            if not alive[i]:
                 continue
             
             for j in range(i + 1, n):
-                if not mask[j]:
+                if not alive[j]:
                     continue
                 
-                sum_2 = arr[i] + arr[j]
-                if sum_2 in checked_sums:
-                    continue
-                
-                checked_sums.add(sum_2)
-                
-                # 只检查大于sum_2的数
-                potential_matches = arr[arr > sum_2]
-                if len(potential_matches) > 0:
-                    relative_diff = np.abs(potential_matches - sum_2)
-                    matches = np.where(relative_diff < tolerance)[0]
-                    for idx in matches:
-                        mask[np.where(arr == potential_matches[idx])[0][0]] = False
+                sum_2 = values[i] + values[j]
+                if sum_2 >= alive_max:
+                    break
+                if self._mask_values_above(values, alive, sum_2, tolerance):
+                    alive_max = self._alive_max(values, alive)
         
-        # 检查三数之和
-        max_value = arr[mask].max() if any(mask) else 0
+        # 检查三数之和，和随k递增
+        max_value = alive_max
         for i in range(n - 2):
-            if not mask[i] or arr[i] * 3 > max_value:
+            if not alive[i] or values[i] * 3 > max_value:
                 continue
             
             for j in range(i + 1, n - 1):
-                if not mask[j] or arr[i] + arr[j] * 2 > max_value:
+                if not alive[j] or values[i] + values[j] * 2 > max_value:
                     continue
                 
                 for k in range(j + 1, n):
-                    if not mask[k]:
-                        continue
-                    
-                    sum_3 = arr[i] + arr[j] + arr[k]
-                    if sum_3 in checked_sums:
+                    if not alive[k]:
                         continue
                     
-                    checked_sums.add(sum_3)
-                    
-                    # 只检查大于sum_3的数
-                    potential_matches = arr[arr > sum_3]
-                    if len(potential_matches) > 0:
-                        relative_diff = np.abs(potential_matches - sum_3)
-                        matches = np.where(relative_diff < tolerance)[0]
-                        for idx in matches:
-                            mask[np.where(arr == potential_matches[idx])[0][0]] = False
+                    sum_3 = values[i] + values[j] + values[k]
+                    if sum_3 >= alive_max:
+                        break
+                    if self._mask_values_above(values, alive, sum_3, tolerance):
+                        alive_max = self._alive_max(values, alive)
         
-        return arr[mask].tolist()
+        return arr[np.array(alive, dtype=bool)].tolist()
+
+    @staticmethod
+    def _alive_max(values: list, alive: list) -> float:
+        """返回保留的数中的最大值
+
+        含负数时整数倍和两数之和可能过滤掉全部的数，此时返回负无穷，后续判断均不再过滤。
+        """
+        return max((v for v, keep in zip(values, alive) if keep), default=float('-inf'))
+
+    @staticmethod
+    def _mask_values_above(values: list, alive: list, value: float, tolerance: float) -> bool:
+        """过滤有序数组中大于value且与其差值小于tolerance的数
 
+        与value接近的数在有序数组中为连续区间，用二分查找定位；相同的数只过滤第一个。
 
+        Args:
+            values (list): 升序排列的数
+            alive (list): 各数是否保留，原地修改
+            value (float): 参考值（两数或三数之和）
+            tolerance (float): 判断误差容限
+
+        Returns:
+            bool: 是否有数被过滤
+        """
+        changed = False
+        idx = bisect.bisect_right(values, value)
+        while idx < len(values) and values[idx] - value < tolerance:
+            first = bisect.bisect_left(values, values[idx])
+            if alive[first]:
+                alive[first] = False
+                changed = True
+            idx += 1
+        return changed
@@ -1,6 +1,8 @@
 import numpy as np
 from PIL import Image
 import os
+import copy
+import uuid
 from dataclasses import dataclass
 from typing import Dict, Optional, Tuple
 import time
@@ -86,8 +88,8 @@ class SignalPlotter:
         self.save_dir = None
         self.slice_length = 250
         
-        # 初始化默认配置
-        self.configs = self.BASE_CONFIGS.copy()
+        # 初始化默认配置（深拷贝：绘图时会修改配置，如DTOA的y_max，各实例之间不能共享）
+        self.configs = copy.deepcopy(self.BASE_CONFIGS)
         self.configs['CF'] = PlotConfig(y_min=4000, y_max=8000, img_height=400, img_width=400)  # 默认C波段
         
     def detect_frequency_band(self, data: np.ndarray) -> Optional[BandConfig]:
@@ -170,13 +172,13 @@ class SignalPlotter:
         try:
             # 确保配置字典已初始化
             if self.configs is None:
-                self.configs = self.BASE_CONFIGS.copy()
+                self.configs = copy.deepcopy(self.BASE_CONFIGS)
             
             # 检测波段
             band_config = self.detect_frequency_band(data)
             if band_config:
                 # 重置为基础配置
-                self.configs = self.BASE_CONFIGS.copy()
+                self.configs = copy.deepcopy(self.BASE_CONFIGS)
                 # 更新CF配置
                 self.configs['CF'] = band_config.plot_config
                 
@@ -206,7 +208,7 @@ class SignalPlotter:
                 return band_config.name
             else:
                 # 使用默认C波段配置
-                self.configs = self.BASE_CONFIGS.copy()
+                self.configs = copy.deepcopy(self.BASE_CONFIGS)
                 self.configs['CF'] = PlotConfig(y_min=4000, y_max=8000, 
                                               img_height=400, img_width=400)
                 self.logger.warning("使用默认C波段配置")
@@ -287,7 +289,7 @@ class SignalPlotter:
                 raise ValueError("未设置目录")
                 
             # 生成基础文件名
-            base_name = (f"temp_{np.random.randint(10000)}" if for_predict else 
+            base_name = (f"temp_{uuid.uuid4().hex}" if for_predict else 
                         f"slice{cluster_data.get('slice_idx', 0)}_"
                         f"{cluster_data.get('dim_name', '?')}_"
                         f"cluster{cluster_data.get('cluster_idx', 0)}")
@@ -340,12 +342,45 @@ class SignalPlotter:
             self.logger.error(f"绘制聚类图像出错: {str(e)}")
             return {}
     
+    def render_cluster(self, cluster_data: dict) -> Dict[str, np.ndarray]:
+        """在内存中生成聚类结果用于预测的PA和DTOA图像
+        
+        图像内容与plot_cluster(for_predict=True)保存的PNG文件一致，但不经过文件读写。
+        
+        Args:
+            cluster_data (dict): 聚类数据字典，字段同plot_cluster
+            
+        Returns:
+            Dict[str, np.ndarray]: 图像字典，键为维度名称，值为uint8灰度图像（0或255），
+                失败时返回空字典
+        """
+        try:
+            points = cluster_data['points']
+            toa = points[:, 4]  # TOA数据
+            slice_start_time, slice_end_time = cluster_data.get('time_ranges', (0, 0))
+            
+            # 计算DTOA，补齐方式同plot_cluster
+            dtoa = np.diff(toa) * 1000  # 转换为us
+            dtoa = np.append(dtoa, dtoa[-1])
+            
+            images = {}
+            for dim_name, ydata in (('PA', points[:, 3]), ('DTOA', dtoa)):
+                image = self._render_dimension(toa, ydata, toa, dim_name, slice_start_time, slice_end_time)
+                if image is None:
+                    return {}
+                images[dim_name] = image
+            return images
+            
+        except Exception as e:
+            self.logger.error(f"生成聚类图像出错: {str(e)}")
+            return {}
+    
     def _plot_dimension(self, data: np.ndarray, ydata: np.ndarray, 
                        xdata: np.ndarray, dim_name: str, 
                        base_name: str, save_dir: str,
                        slice_start_time: float = None,
                        slice_end_time: float = None) -> str:
-        """绘制单个维度的二值化图像
+        """绘制单个维度的二值化图像并保存
         
         Args:
             data (np.ndarray): 原始TOA数据
@@ -360,12 +395,44 @@ class SignalPlotter:
         Returns:
             str: 保存的图像文件路径，失败时返回空字符串
         """
+        image = self._render_dimension(data, ydata, xdata, dim_name, slice_start_time, slice_end_time)
+        if image is None:
+            return ""
+        
+        try:
+            # 保存图像
+            filename = os.path.join(save_dir, f"{base_name}_{dim_name.lower()}.png")
+            Image.fromarray(image).save(filename)
+            
+            return filename
+            
+        except Exception as e:
+            self.logger.error(f"保存{dim_name}维度图像出错: {str(e)}")
+            return ""
+    
+    def _render_dimension(self, data: np.ndarray, ydata: np.ndarray, 
+                          xdata: np.ndarray, dim_name: str,
+                          slice_start_time: float = None,
+                          slice_end_time: float = None) -> Optional[np.ndarray]:
+        """生成单个维度的二值化图像
+        
+        Args:
+            data (np.ndarray): 原始TOA数据
+            ydata (np.ndarray): Y轴数据
+            xdata (np.ndarray): X轴数据（通常是TOA）
+            dim_name (str): 维度名称
+            slice_start_time (float, optional): 切片起始时间
+            slice_end_time (float, optional): 切片结束时间
+            
+        Returns:
+            Optional[np.ndarray]: uint8灰度图像，数据点处为255，失败时返回None
+        """
         try:
             # 获取当前配置
             config = self.configs.get(dim_name)
             if not config:
                 self.logger.error(f"未找到维度 {dim_name} 的配置")
-                return ""
+                return None
             
             # 确保数据类型为 numpy array
             data = np.asarray(data, dtype=np.float64)
@@ -409,15 +476,11 @@ class SignalPlotter:
                     binary_image[scaled_y[i] - 1, scaled_x[i] - 1] = 1
                     valid_points += 1
             
-            # 保存图像
-            filename = os.path.join(save_dir, f"{base_name}_{dim_name.lower()}.png")
-            Image.fromarray(binary_image.astype(np.uint8) * 255).save(filename)
-            
-            return filename
+            return binary_image.astype(np.uint8) * 255
             
         except Exception as e:
             self.logger.error(f"绘制{dim_name}维度图像出错: {str(e)}")
-            return ""
+            return None
     
     def plot_slice(self, slice_data: np.ndarray, base_name: str) -> Dict[str, str]:
         """生成切片的所有维度图像
@@ -1,7 +1,117 @@
 import numpy as np
 from numpy.typing import NDArray
 from .log_manager import LogManager
-from sklearn.cluster import DBSCAN
+
+def dbscan_1d(values: NDArray, epsilon: float, min_pts: int) -> NDArray:
+    """一维数据的DBSCAN聚类
+    
+    排序后用二分查找确定每个点的邻域范围，复杂度为O(N log N)，无需构建邻域列表。
+    结果与sklearn的DBSCAN一致：核心点按距离连通成类，类别按其核心点的最小原始索引编号，
+    边界点归入邻域内编号最小的类别。
+    
+    Args:
+        values: NDArray, 一维数据
+        epsilon: float, 邻域半径
+        min_pts: int, 核心点的最小邻域点数（含自身）
+    
+    Returns:
+        NDArray: 聚类标签，-1表示噪声点
+    """
+    # 排序
+    n = len(values)
+    order = np.argsort(values, kind='stable')
+    sorted_data = values[order]
+    
+    # 邻域点数（含自身）不小于min_pts的为核心点
+    lower, upper = _sorted_neighbor_bounds(sorted_data, epsilon)
+    is_core = (upper - lower) >= min_pts
+    
+    sorted_labels = np.full(n, -1, dtype=np.int64)
+    cluster_count = 0
+    core_pos = np.flatnonzero(is_core)
+    if core_pos.size:
+        # 相邻核心点距离超过epsilon处断开，得到各连通类别
+        new_cluster = np.empty(core_pos.size, dtype=bool)
+        new_cluster[0] = True
+        new_cluster[1:] = np.diff(sorted_data[core_pos]) > epsilon
+        cluster_ids = np.cumsum(new_cluster) - 1
+        cluster_count = cluster_ids[-1] + 1
+        
+        # 按各类别核心点的最小原始索引重新编号
+        first_idx = np.full(cluster_count, n, dtype=np.int64)
+        np.minimum.at(first_idx, cluster_ids, order[core_pos])
+        rank = np.empty(cluster_count, dtype=np.int64)
+        rank[np.argsort(first_idx, kind='stable')] = np.arange(cluster_count)
+        core_labels = rank[cluster_ids]
+        sorted_labels[core_pos] = core_labels
+        
+        # 边界点只可能与左右最近的核心点相邻，取距离不超过epsilon者中编号较小的类别
+        border_pos = np.flatnonzero(~is_core)
+        if border_pos.size:
+            right = np.searchsorted(core_pos, border_pos)
+            left = right - 1
+            no_label = np.iinfo(np.int64).max
+            border_labels = np.full(border_pos.size, no_label, dtype=np.int64)
+            
+            has_left = left >= 0
+            left_core = left[has_left]
+            near = sorted_data[border_pos[has_left]] - sorted_data[core_pos[left_core]] <= epsilon
+            border_labels[has_left] = np.where(near, core_labels[left_core], no_label)
+            
+            has_right = right < core_pos.size
+            right_core = right[has_right]
+            near = sorted_data[core_pos[right_core]] - sorted_data[border_pos[has_right]] <= epsilon
+            border_labels[has_right] = np.minimum(border_labels[has_right],
+                                                  np.where(near, core_labels[right_core], no_label))
+            
+            assigned = border_labels != no_label
+            sorted_labels[border_pos[assigned]] = border_labels[assigned]
+    
+    # 恢复原始顺序
+    labels = np.empty(n, dtype=np.int64)
+    labels[order] = sorted_labels
+    return labels
+
+
+def _sorted_neighbor_bounds(sorted_data: NDArray, epsilon: float) -> tuple:
+    """计算有序一维数据中每个点的邻域范围
+    
+    先按 x±epsilon 二分查找，再修正浮点舍入造成的边界偏差，
+    保证邻域严格满足 |x_j - x_i| <= epsilon。
+    
+    Args:
+        sorted_data: NDArray, 升序排列的一维数据
+        epsilon: float, 邻域半径
+    
+    Returns:
+        tuple: (lower, upper)，第i个点的邻域为sorted_data[lower[i]:upper[i]]
+    """
+    n = len(sorted_data)
+    lower = np.searchsorted(sorted_data, sorted_data - epsilon, side='left')
+    upper = np.searchsorted(sorted_data, sorted_data + epsilon, side='right')
+    
+    # 修正上界：逐个相等值块扩展或收缩，直至边界两侧满足距离条件
+    while True:
+        grow = upper < n
+        grow[grow] = sorted_data[upper[grow]] - sorted_data[grow] <= epsilon
+        shrink = sorted_data[upper - 1] - sorted_data > epsilon
+        if not (grow.any() or shrink.any()):
+            break
+        upper[grow] = np.searchsorted(sorted_data, sorted_data[upper[grow]], side='right')
+        upper[shrink] = np.searchsorted(sorted_data, sorted_data[upper[shrink] - 1], side='left')
+    
+    # 修正下界
+    while True:
+        grow = lower > 0
+        grow[grow] = sorted_data[grow] - sorted_data[lower[grow] - 1] <= epsilon
+        shrink = sorted_data - sorted_data[lower] > epsilon
+        if not (grow.any() or shrink.any()):
+            break
+        lower[grow] = np.searchsorted(sorted_data, sorted_data[lower[grow] - 1], side='left')
+        lower[shrink] = np.searchsorted(sorted_data, sorted_data[lower[shrink]], side='right')
+    
+    return lower, upper
+
 
 class RoughClusterer:
     """一维密度聚类器
@@ -69,12 +179,14 @@ class RoughClusterer:
             current_label += 1
         return labels
     
-    def fit_dbscan(self, data: NDArray, dim: int) -> NDArray:
+    def fit_dbscan(self, data: NDArray, dim: int = 0) -> NDArray:
         """使用DBSCAN算法对指定维度进行聚类
         
+        聚类维度为一维，由dbscan_1d排序后按邻域范围聚类，结果与sklearn的DBSCAN一致。
+        
         Args:
-            data: NDArray, 输入数据
-            dim: int, 聚类维度 (0:CF, 1:PW)
+            data: NDArray, 输入数据，可直接传入聚类维度的一维连续数组以减少内存访问量
+            dim: int, 聚类维度 (0:CF, 1:PW)，仅在输入为二维数据时使用
         
         Returns:
             NDArray: 聚类标签，-1表示噪声点
@@ -87,22 +199,11 @@ class RoughClusterer:
                 self.logger.warning("输入数据为空")
                 return np.array([])
                 
-            # 获取指定维度的数据并重塑为二维数组
-            dim_data = data[:, dim].reshape(-1, 1)
-            
-            # 创建DBSCAN实例
-            dbscan = DBSCAN(
-                eps=self.epsilon,
-                min_samples=self.min_pts,
-                metric='euclidean',
-                n_jobs=1
-            )
-            
-            # 执行聚类
-            # print(f"开始DBSCAN聚类，epsilon={self.epsilon}, min_samples={self.min_pts}")
-            labels = dbscan.fit_predict(dim_data)
+            # 获取指定维度的数据
+            dim_data = data if data.ndim == 1 else data[:, dim]
+            labels = dbscan_1d(dim_data, self.epsilon, self.min_pts)
             
-            self.logger.debug(f"DBSCAN聚类完成，共{len(np.unique(labels))-1}个类别")
+            self.logger.debug("DBSCAN聚类完成，共%d个类别", labels.max() + 1)
             return labels
             
         except Exception as e:
@@ -1,11 +1,14 @@
 import sys
+import multiprocessing
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtGui import QIcon
-from ui.main_window import MainWindow
 
 
 def main():
     """程序入口函数"""
+    # 在函数内导入主窗口，保存子进程以spawn方式导入本模块时无需加载界面和模型依赖
+    from ui.main_window import MainWindow
+
     # 创建应用实例
     app = QApplication(sys.argv)
 
@@ -21,4 +24,6 @@ def main():
 
 
 if __name__ == '__main__':
+    # 打包后的程序启动保存子进程时需要
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,162 @@
+"""参数提取器测试
+
+将向量化后的ParamsExtractor与原逐个处理的实现在随机输入上逐一比较，
+确保结果完全一致。
+"""
+
+import unittest
+
+import numpy as np
+
+from cores.params_extractor import ParamsExtractor
+from cores.roughly_clustering import dbscan_1d
+
+
+def _extract_grouped_values_reference(data: list, eps: float = 0.5, min_samples: int = 3,
+                                      threshold_ratio: float = 0.1) -> list:
+    """extract_grouped_values的原实现，逐簇统计大小和均值
+
+    聚类标签同样取自dbscan_1d，只比较其后的统计部分。
+    """
+    labels = dbscan_1d(np.array(data, dtype=float), eps, min_samples)
+
+    grouped_values = []
+    clusters_with_multiple_samples = sum(1 for label in set(labels) if label != -1 and np.sum(labels == label) >= 2)
+    expected_min_size = len(data) / max(clusters_with_multiple_samples, 1) * threshold_ratio
+
+    for label in set(labels):
+        current_cluster_size = np.sum(labels == label)
+        if label != -1 and current_cluster_size > expected_min_size:
+            cluster_values = [data[i] for i in range(len(data)) if labels[i] == label]
+            grouped_values.append(np.round(np.mean(cluster_values), 4))
+
+    return grouped_values
+
+
+def _filter_related_numbers_reference(numbers: list, tolerance: float = 0.4) -> list:
+    """filter_related_numbers的原实现，逐个判断整数倍和两数、三数之和"""
+    if not numbers:
+        return []
+
+    arr = np.array(sorted(numbers))
+    n = len(arr)
+    mask = np.ones(n, dtype=bool)
+
+    max_ratio = int(arr[-1] / arr[0] + 1) if arr[0] != 0 else 1
+    possible_multiples = np.arange(1, max_ratio + 1)
+
+    for i in range(n - 1):
+        if not mask[i]:
+            continue
+        multiples = arr[i] * possible_multiples
+        for j in range(i + 1, n):
+            if not mask[j]:
+                continue
+            if len(multiples) == 0:
+                continue
+            closest_multiple = multiples[np.argmin(np.abs(multiples - arr[j]))]
+            if abs(arr[j] - closest_multiple) < tolerance:
+                mask[j] = False
+
+    checked_sums = set()
+
+    for i in range(n - 1):
+        if not mask[i]:
+            continue
+        for j in range(i + 1, n):
+            if not mask[j]:
+                continue
+            sum_2 = arr[i] + arr[j]
+            if sum_2 in checked_sums:
+                continue
+            checked_sums.add(sum_2)
+            potential_matches = arr[arr > sum_2]
+            if len(potential_matches) > 0:
+                matches = np.where(np.abs(potential_matches - sum_2) < tolerance)[0]
+                for idx in matches:
+                    mask[np.where(arr == potential_matches[idx])[0][0]] = False
+
+    max_value = arr[mask].max() if any(mask) else 0
+    for i in range(n - 2):
+        if not mask[i] or arr[i] * 3 > max_value:
+            continue
+        for j in range(i + 1, n - 1):
+            if not mask[j] or arr[i] + arr[j] * 2 > max_value:
+                continue
+            for k in range(j + 1, n):
+                if not mask[k]:
+                    continue
+                sum_3 = arr[i] + arr[j] + arr[k]
+                if sum_3 in checked_sums:
+                    continue
+                checked_sums.add(sum_3)
+                potential_matches = arr[arr > sum_3]
+                if len(potential_matches) > 0:
+                    matches = np.where(np.abs(potential_matches - sum_3) < tolerance)[0]
+                    for idx in matches:
+                        mask[np.where(arr == potential_matches[idx])[0][0]] = False
+
+    return arr[mask].tolist()
+
+
+class TestExtractGroupedValues(unittest.TestCase):
+    """extract_grouped_values与原实现的一致性测试"""
+
+    def setUp(self):
+        self.extractor = ParamsExtractor()
+
+    def test_matches_reference_on_random_inputs(self):
+        """随机DTOA数据（多组、噪声点、均值落在舍入边界附近）的结果与原实现一致"""
+        rng = np.random.default_rng(0)
+        for case in range(1500):
+            group_count = int(rng.integers(1, 5))
+            centers = rng.uniform(1, 60, group_count)
+            sizes = rng.integers(1, 30, group_count)
+            data = np.concatenate([rng.normal(center, 0.15, size) for center, size in zip(centers, sizes)])
+            data = np.concatenate([data, rng.uniform(0, 80, int(rng.integers(0, 6)))])
+            # 部分用例保留较少小数位，使簇均值更容易恰好落在舍入的中间值上
+            data = np.round(data, int(rng.integers(1, 5)))
+            rng.shuffle(data)
+            data = data.tolist()
+            with self.subTest(data=data):
+                self.assertEqual(self.extractor.extract_grouped_values(data),
+                                 _extract_grouped_values_reference(data))
+
+
+class TestFilterRelatedNumbers(unittest.TestCase):
+    """filter_related_numbers与原实现的一致性测试"""
+
+    def setUp(self):
+        self.extractor = ParamsExtractor()
+
+    def test_all_filtered_with_negative_values(self):
+        """含负数时全部被过滤应返回空列表"""
+        numbers = [-12.4, 59.3, -11.9, 33.4, -7.8, 9.6, -10.8, 46.7, 59.7,
+                   -0.1, 30.7, 34.1, -0.3, -7.9, 19.4, 14.2]
+        self.assertEqual(self.extractor.filter_related_numbers(numbers), [])
+        self.assertEqual(_filter_related_numbers_reference(numbers), [])
+
+    def test_matches_reference_on_random_inputs(self):
+        """随机输入（含负数、重复值和谐波）的结果与原实现一致"""
+        rng = np.random.default_rng(0)
+        for case in range(1500):
+            size = int(rng.integers(1, 18))
+            if case % 3 == 0:
+                # 正负混合的DTOA组均值
+                numbers = np.round(rng.uniform(-15, 60, size), 1)
+            elif case % 3 == 1:
+                # 基频及其谐波、组合
+                base = rng.uniform(5, 50, 3)
+                numbers = np.concatenate([base, base[rng.integers(0, 3, size)] * rng.integers(1, 5, size)])
+                numbers = np.round(numbers + rng.normal(0, 0.2, len(numbers)), 1)
+            else:
+                # 含重复值
+                numbers = np.round(rng.choice(rng.uniform(1, 100, 6), size), 1)
+            numbers = numbers.tolist()
+            with self.subTest(numbers=numbers):
+                self.assertEqual(self.extractor.filter_related_numbers(numbers),
+                                 _filter_related_numbers_reference(numbers))
+
+
+if __name__ == '__main__':
+    unittest.main()
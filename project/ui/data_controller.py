@@ -8,7 +8,6 @@ from cores.model_predictor import ModelPredictor
 from cores.log_manager import LogManager
 from cores.params_extractor import ParamsExtractor
 import numpy as np
-import pandas as pd
 from cores.ThreadWorker import DataWorker, IdentifyWorker, SliceWorker, FullSpeedWorker
 
 # 设置环境变量
@@ -147,6 +146,7 @@ class DataController(QObject):
         self.current_cluster_idx = -1  # 当前显示的类别索引
         # self.only_show_identify_result = False  # 默认显示所有聚类结果
         self.only_show_identify_result = True  # 默认仅显示识别结果
+        self.one_sheet_per_slice = True  # 全速处理脉冲数据默认每个切片单独一个sheet，关闭时所有切片写入同一sheet
 
         # 添加保存状态跟踪
         self.saved_states = {}  # 保存状态哈希映射
@@ -696,31 +696,38 @@ class DataController(QObject):
         Raises:
             KeyError: 访问字典中不存在的键时抛出
         """
-        
-        dtoa = np.diff(cluster_info['cluster_data']['points'][:, 4]) * 1000  # 转换为us
+        (cluster_info['CF'], cluster_info['PW'],
+         cluster_info['PRI'], cluster_info['DOA']) = self._compute_cluster_parameters(cluster_info['cluster_data']['points'])
+
+    def _compute_cluster_parameters(self, points: np.ndarray) -> Tuple[list, list, list, list]:
+        """计算聚类的载频、脉宽、PRI和方位角参数。
+
+        Args:
+            points (np.ndarray): 聚类脉冲数据，列依次为载频、脉宽、方位角、幅度、到达时间
+
+        Returns:
+            Tuple[list, list, list, list]: 载频、脉宽、PRI、方位角的分组值
+        """
+        dtoa = np.diff(points[:, 4]) * 1000  # 转换为us
         dtoa = np.append(dtoa, 0)  # 补齐长度
         # 调试用
         # if self.current_slice_idx == 4 and cluster_info['cluster_idx'] == 3:
         #     print(f"DTOA: {dtoa}")
 
         # 获取分组值
-        cf_grouped_values = self.params_extractor.extract_grouped_values(cluster_info['cluster_data']['points'][:, 0], eps=2, min_samples=4, threshold_ratio=0.1)
-        pw_grouped_values = self.params_extractor.extract_grouped_values(cluster_info['cluster_data']['points'][:, 1], eps=0.2, min_samples=4, threshold_ratio=0.1)
+        cf_grouped_values = self.params_extractor.extract_grouped_values(points[:, 0], eps=2, min_samples=4, threshold_ratio=0.1)
+        pw_grouped_values = self.params_extractor.extract_grouped_values(points[:, 1], eps=0.2, min_samples=4, threshold_ratio=0.1)
         pri_grouped_values = self.params_extractor.extract_grouped_values(dtoa, eps=0.2, min_samples=3, threshold_ratio=0.1)
-        doa_grouped_values = self.params_extractor.extract_grouped_values(cluster_info['cluster_data']['points'][:, 2], eps=10, min_samples=3, threshold_ratio=0.1)
+        doa_grouped_values = self.params_extractor.extract_grouped_values(points[:, 2], eps=10, min_samples=3, threshold_ratio=0.1)
         # 方位角特殊处理
         if not doa_grouped_values:
-            doa_grouped_values = sorted(cluster_info['cluster_data']['points'][:, 2])
+            doa_grouped_values = sorted(points[:, 2])
             doa_grouped_values = [np.mean(doa_grouped_values[1:-1])]
         # 抑制谐波
         if pri_grouped_values:
             pri_grouped_values = self.params_extractor.filter_related_numbers(pri_grouped_values)
         
-        cluster_info['CF'] = cf_grouped_values
-        cluster_info['PW'] = pw_grouped_values
-        cluster_info['PRI'] = pri_grouped_values
-        cluster_info['DOA'] = doa_grouped_values
-        
+        return cf_grouped_values, pw_grouped_values, pri_grouped_values, doa_grouped_values
 
     def sync_params_to_table(self, cluster_info: dict) -> None:
         """同步参数到表格
@@ -858,7 +865,7 @@ class DataController(QObject):
             
             # 初始化处理数据
             current_data = current_slice
-            recycled_data = []
+            recycled_arrays = []  # 无效聚类的数据点，保持为数组避免逐点转换
             dim_idx = {'CF': 0, 'PW': 0}
             cluster_count = 0
             
@@ -867,19 +874,20 @@ class DataController(QObject):
                 success, cluster_result = self.cluster_processor.process_dimension(dimension, current_data)
                 
                 if success and cluster_result:
+                    # 确保每个cluster包含必要的字段，整个维度的聚类一次性批量预测
+                    clusters = cluster_result['clusters']
+                    cluster_data_list = [{
+                        'points': cluster['points'],
+                        'time_ranges': self.cluster_processor.time_ranges,
+                        'slice_idx': self.current_slice_idx,
+                        'dim_name': dimension,
+                        'cluster_idx': cluster_count + i + 1
+                    } for i, cluster in enumerate(clusters)]
+                    predictions = self.predictor.predict_batch(cluster_data_list)
+                    
                     # 处理聚类结果
-                    for cluster in cluster_result['clusters']:
-                        # 确保cluster包含必要的字段
-                        cluster_data = {
-                            'points': cluster['points'],
-                            'time_ranges': self.cluster_processor.time_ranges,
-                            'slice_idx': self.current_slice_idx,
-                            'dim_name': dimension,
-                            'cluster_idx': cluster_count + 1
-                        }
-                        
-                        # 预测
-                        success, pa_conf, dtoa_conf, pa_label, dtoa_label, pa_conf_dict, dtoa_conf_dict = self.predictor.predict(cluster_data)
+                    for cluster, prediction in zip(clusters, predictions):
+                        success, pa_conf, dtoa_conf, pa_label, dtoa_label, pa_conf_dict, dtoa_conf_dict = prediction
                         
                         if success:
                             # 提取有效雷达标签对应概率
@@ -895,28 +903,8 @@ class DataController(QObject):
 
                             # 雷达有效时，对于脉间参差类别的特殊判别
                             if is_valid and dtoa_label == 1:
-                                # 计算dtoa的集中度
-                                dtoa = np.diff(cluster['points'][:, 4]) * 1000  # 转换为us
-                                
-                                # 计算统计指标
-                                dtoa_median = np.median(dtoa)
-                                dtoa_min = np.min(dtoa)
-                                dtoa_max = np.max(dtoa)
-                                
-                                # 判断条件：
-                                # 1. 数据范围不能超过1000us
-                                # 2. 大部分数据应该在中位数/均值附近
-                                data_range = dtoa_max - dtoa_min
-                                is_range_valid = data_range <= 1000  # 范围阈值可调
-                                
-                                # 计算在中位数一定范围内的数据比例
-                                center_range_ratio = 0.35  # 可调35%
-                                in_center_count = np.sum(np.abs(dtoa - dtoa_median) <= center_range_ratio * dtoa_median)
-                                center_ratio = in_center_count / len(dtoa)
-                                is_centered = center_ratio >= 0.7  # 比例阈值可调
-                                
-                                # 综合判断
-                                if not (is_range_valid or is_centered):
+                                # DTOA范围过大且不集中于中位数附近时判为无效
+                                if not self.params_extractor.is_dtoa_concentrated(cluster['points'][:, 4]):
                                     is_valid = False
 
                             # 生成图像
@@ -948,7 +936,7 @@ class DataController(QObject):
                             
                             # 处理无效数据
                             if not is_valid:
-                                recycled_data.extend(cluster['points'].tolist())
+                                recycled_arrays.append(cluster['points'])
                                 
                             # 保存聚类结果
                             if not self.only_show_identify_result or is_valid:
@@ -956,15 +944,14 @@ class DataController(QObject):
                                 self.valid_clusters.append(cluster_info)
                     
                     # 更新待处理数据
-                    unprocessed_data = cluster_result.get('unprocessed_points', [])
-                    if not isinstance(unprocessed_data, list):
-                        unprocessed_data = unprocessed_data.tolist()
+                    unprocessed_data = np.asarray(cluster_result.get('unprocessed_points', []))
                     
                     # 合并回收数据和未聚类数据
-                    if recycled_data and unprocessed_data:
-                        current_data = np.vstack((recycled_data, unprocessed_data))
-                    elif recycled_data:
-                        current_data = recycled_data
+                    if recycled_arrays:
+                        if len(unprocessed_data) > 0:
+                            current_data = np.vstack(recycled_arrays + [unprocessed_data])
+                        else:
+                            current_data = np.vstack(recycled_arrays)
                     else:
                         current_data = unprocessed_data
             
@@ -1238,6 +1225,8 @@ class DataController(QObject):
             Tuple[bool, str]: 是否成功，以及相关消息
         """
         try:
+            # pandas仅在保存结果时使用，延迟导入以缩短程序启动时间
+            import pandas as pd
             
             self.logger.info(f"开始保存识别结果到目录: {save_dir}")
             